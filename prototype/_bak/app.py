@@ -12,22 +12,60 @@ Features:
 Author: PBPK Simulation Team
 """
 
+import base64
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
 import requests
-from dash import Dash, html, dcc, Input, Output, State, callback
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dash import (Dash, html, dcc, Input, Output, State, callback, Patch,
+                  ClientsideFunction)
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import plotly.io as pio
+from flask.json.provider import DefaultJSONProvider
 
-from pbpk_model import (
-    PBPKModel, DrugParameters, PhysiologicalParameters, 
-    SimulationConfig, run_population_simulation
-)
+# orjson은 선택 의존성: 설치되어 있으면 콜백 JSON 직렬화/파싱에 사용
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from pbpk_model import DrugParameters, SimulationConfig, run_population_simulation
 from engine import (
-    PopulationGenerator, Ethnicity, MetabolizerStatus,
-    calculate_safety_margin
+    PopulationGenerator, Ethnicity,
+    ETHNICITY_ORDER, calculate_safety_margin
 )
 
+# ============================================================================
+# Warm-up
+# ============================================================================
+
+def _warmup():
+    """첫 클릭 지연을 줄이기 위한 10명 규모 더미 시뮬레이션
+
+    import 시점에 인구집단 생성 + PBPK 풀이를 한 번 실행하여
+    SciPy 적분기 로딩 등 최초 호출 비용을 서버 기동 시에 미리 지불합니다.
+    """
+    try:
+        population = PopulationGenerator(n_subjects=10).generate_arrays()
+        run_population_simulation(
+            DrugParameters(),
+            population['phys'],
+            SimulationConfig(t_max=1, n_points=11)
+        )
+    except Exception as e:
+        print(f"Warm-up skipped: {e}")
+
+
+_warmup()
+
 # ============================================================================
 # App Initialization
 # ============================================================================
@@ -39,6 +77,30 @@ app = Dash(
     suppress_callback_exceptions=True
 )
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson 기반 Flask JSON provider (콜백 요청 본문 파싱 가속)
+
+    NumPy 배열은 그대로 직렬화하고, 그 밖의 타입(날짜, UUID 등)은
+    Flask 기본 변환 규칙(self.default)을 그대로 따릅니다.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+if orjson is not None:
+    # Dash 콜백 응답은 plotly.io 인코더를 거치므로 엔진도 함께 전환
+    pio.json.config.default_engine = 'orjson'
+    app.server.json = OrjsonProvider(app.server)
+
 # Color Palette
 COLORS = {
     'primary': '#1E3A5F',      # Deep Medical Blue
@@ -54,32 +116,158 @@ COLORS = {
     'gradient_end': '#764ba2'
 }
 
+# 인구집단 Store의 대사자 표현형 코드 → 약어 (코드 = engine.METABOLIZER_ORDER 인덱스)
+METABOLIZER_LABELS = ['PM', 'IM', 'NM', 'UM']
+
+# 대사자 표현형 코드 → 마커 색상 룩업 테이블 (COLOR_LUT[codes]로 한 번에 변환)
+COLOR_LUT = np.array(['#E74C3C', '#F39C12', '#2ECC71', '#3498DB'])  # 빨강, 노랑, 초록, 파랑
+
+# 툴팁용 코드 → 라벨 룩업 테이블
+ETHNICITY_LABELS = np.array([eth.value for eth in ETHNICITY_ORDER])
+METABOLIZER_LABEL_LUT = np.array(METABOLIZER_LABELS)
+
+# 디지털 트윈에 기본으로 그리는 최대 인원 (초과 시 층화 표본)
+TWIN_SAMPLE_LIMIT = 500
+
+# 디지털 트윈 figure 공통 레이아웃 (콜백마다 새로 만들지 않도록 모듈 상수로 둠)
+TWIN_LAYOUT = go.Layout(
+    template='plotly_white',
+    margin=dict(l=10, r=10, t=10, b=10),
+    xaxis=dict(visible=False),
+    yaxis=dict(visible=False, autorange='reversed'),  # ID 1이 좌상단에 오도록
+    showlegend=False,
+    plot_bgcolor='#F8FAFC'
+)
+
+# PK 곡선 개인별 오버레이: 최대 곡선 수와 시간축 솎기 간격
+PK_OVERLAY_LIMIT = 30
+PK_OVERLAY_STRIDE = 4
+
 # ============================================================================
 # PubChem API Integration
 # ============================================================================
 
+# PubChem 연결 재사용 (keep-alive로 두 번째 조회부터 TCP/TLS 핸드셰이크 생략)
+# 일시적인 5xx/429 응답은 짧은 backoff로 최대 2회 재시도
+_pubchem_session = requests.Session()
+_pubchem_session.mount('https://', HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=('GET',)
+    )
+))
+
+# (연결 timeout, 읽기 timeout) 초
+PUBCHEM_TIMEOUT = (2, 8)
+
+
+@lru_cache(maxsize=512)
+def _query_pubchem(drug_key: str) -> dict:
+    """PubChem REST 조회 (정규화된 약물명 기준으로 프로세스 내 캐싱)
+
+    조회에 실패하면 예외를 던져 실패 결과가 캐시에 남지 않도록 합니다.
+    """
+    search_url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/{drug_key}/property/MolecularWeight,XLogP,IUPACName/JSON"
+    response = _pubchem_session.get(search_url, timeout=PUBCHEM_TIMEOUT)
+    response.raise_for_status()
+
+    props = response.json()['PropertyTable']['Properties'][0]
+    return {
+        'mw': float(props.get('MolecularWeight', 300)),
+        'log_p': float(props.get('XLogP', 2.0)),
+        'iupac_name': props.get('IUPACName', '')
+    }
+
+
 def fetch_pubchem_data(drug_name: str) -> dict:
-    """PubChem에서 약물 데이터 가져오기"""
+    """PubChem에서 약물 데이터 가져오기
+
+    약물명은 공백 제거 + 소문자로 정규화하여 캐시 키로 사용합니다.
+    LRU 캐시 → PubChem API 순으로 조회합니다.
+    """
+    drug_key = drug_name.strip().lower()
+
     try:
-        # Search for compound
-        search_url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/{drug_name}/property/MolecularWeight,XLogP,IUPACName/JSON"
-        response = requests.get(search_url, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            props = data['PropertyTable']['Properties'][0]
-            return {
-                'found': True,
-                'name': drug_name,
-                'mw': props.get('MolecularWeight', 300),
-                'log_p': props.get('XLogP', 2.0),
-                'iupac_name': props.get('IUPACName', '')
-            }
+        props = _query_pubchem(drug_key)
+        # 캐시된 dict가 호출 측에서 변경되지 않도록 복사본 반환
+        return {'found': True, 'name': drug_name, **props}
     except Exception as e:
         print(f"PubChem API error: {e}")
-    
+
     return {'found': False}
 
+# ============================================================================
+# Server-side Result Cache
+# ============================================================================
+
+# 인구집단 배열과 시뮬레이션 결과(N×T 농도 행렬 포함)는 서버 메모리에 보관하고
+# 브라우저 Store에는 조회 키(UUID)만 저장하여 콜백 payload를 최소화
+SIM_CACHE_SIZE = 32          # 보관할 최대 결과 개수 (오래된 것부터 제거)
+SIM_CACHE_TIMEOUT = 3600     # 결과 유효 시간 (초)
+POP_CACHE_SIZE = 16          # 보관할 최대 인구집단 개수
+POP_CACHE_TIMEOUT = 3600     # 인구집단 유효 시간 (초)
+
+
+class ServerCache:
+    """UUID 키 → 값을 보관하는 크기/시간 제한 LRU 캐시 (스레드 안전)"""
+    
+    def __init__(self, max_size: int, timeout: float):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()   # key -> (저장 시각, 값)
+        self._lock = threading.Lock()
+    
+    def put(self, value) -> str:
+        """값을 저장하고 조회 키 반환"""
+        key = str(uuid.uuid4())
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return key
+    
+    def get(self, key: str):
+        """조회 키로 값 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.timeout:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+
+_SIM_CACHE = ServerCache(SIM_CACHE_SIZE, SIM_CACHE_TIMEOUT)
+_POP_CACHE = ServerCache(POP_CACHE_SIZE, POP_CACHE_TIMEOUT)
+
+
+def cache_simulation_result(result: dict) -> str:
+    """시뮬레이션 결과를 서버 캐시에 저장하고 조회 키 반환"""
+    return _SIM_CACHE.put(result)
+
+
+def get_simulation_result(key: str):
+    """조회 키로 캐시된 시뮬레이션 결과 반환 (없거나 만료되면 None)"""
+    return _SIM_CACHE.get(key)
+
+
+def cache_population(columns: dict) -> str:
+    """인구집단 필드별 배열을 서버 캐시에 저장하고 조회 키 반환"""
+    return _POP_CACHE.put(columns)
+
+
+def get_population(key: str):
+    """조회 키로 캐시된 인구집단 필드별 배열 반환 (없거나 만료되면 None)"""
+    return _POP_CACHE.get(key)
+
+
 # ============================================================================
 # UI Components
 # ============================================================================
@@ -91,17 +279,15 @@ def create_header():
             dbc.Row([
                 dbc.Col([
                     html.Div([
-                        html.Span("🧬", style={'fontSize': '2rem', 'marginRight': '10px'}),
-                        html.Span("Virtual Population PBPK Simulator", 
-                                 style={'fontSize': '1.5rem', 'fontWeight': '600', 'color': 'white'})
-                    ], style={'display': 'flex', 'alignItems': 'center'})
+                        html.Span("🧬", className='navbar-logo'),
+                        html.Span("Virtual Population PBPK Simulator", className='navbar-title')
+                    ], className='navbar-brand-block')
                 ], width='auto'),
             ], align='center', className='w-100'),
         ], fluid=True),
         color=COLORS['primary'],
         dark=True,
-        className='mb-4',
-        style={'boxShadow': '0 2px 10px rgba(0,0,0,0.1)'}
+        className='mb-4 navbar-medical'
     )
 
 
@@ -109,9 +295,8 @@ def create_population_card():
     """인구집단 설정 카드"""
     return dbc.Card([
         dbc.CardHeader([
-            html.H5("👥 인구집단 설정", className='mb-0', 
-                   style={'color': COLORS['primary'], 'fontWeight': '600'})
-        ], style={'backgroundColor': '#F1F5F9'}),
+            html.H5("👥 인구집단 설정", className='mb-0 card-title-medical')
+        ], className='card-header-medical'),
         dbc.CardBody([
             # Total N
             html.Label("총 인원수 (N)", className='fw-semibold text-muted mb-1'),
@@ -119,7 +304,8 @@ def create_population_card():
                 id='n-subjects',
                 min=100, max=2000, step=100, value=1000,
                 marks={100: '100', 500: '500', 1000: '1K', 1500: '1.5K', 2000: '2K'},
-                tooltip={'placement': 'bottom', 'always_visible': True}
+                tooltip={'placement': 'bottom', 'always_visible': True},
+                updatemode='mouseup'  # 드래그 중간값으로 콜백이 연쇄 호출되지 않도록
             ),
             html.Hr(className='my-3'),
             
@@ -128,17 +314,17 @@ def create_population_card():
             dbc.Row([
                 dbc.Col([
                     html.Small("East Asian", className='text-muted'),
-                    dbc.Input(id='eth-asian', type='number', value=50, min=0, max=100, 
+                    dbc.Input(id='eth-asian', type='number', debounce=True, value=50, min=0, max=100, 
                              size='sm', className='text-center')
                 ], width=4),
                 dbc.Col([
                     html.Small("European", className='text-muted'),
-                    dbc.Input(id='eth-european', type='number', value=30, min=0, max=100,
+                    dbc.Input(id='eth-european', type='number', debounce=True, value=30, min=0, max=100,
                              size='sm', className='text-center')
                 ], width=4),
                 dbc.Col([
                     html.Small("African", className='text-muted'),
-                    dbc.Input(id='eth-african', type='number', value=20, min=0, max=100,
+                    dbc.Input(id='eth-african', type='number', debounce=True, value=20, min=0, max=100,
                              size='sm', className='text-center')
                 ], width=4),
             ], className='mb-3'),
@@ -151,7 +337,8 @@ def create_population_card():
                 id='age-range',
                 min=18, max=80, step=1, value=[18, 65],
                 marks={18: '18', 30: '30', 45: '45', 60: '60', 80: '80'},
-                tooltip={'placement': 'bottom', 'always_visible': True}
+                tooltip={'placement': 'bottom', 'always_visible': True},
+                updatemode='mouseup'  # 드래그 중간값으로 콜백이 연쇄 호출되지 않도록
             ),
             html.Hr(className='my-3'),
             
@@ -161,49 +348,48 @@ def create_population_card():
                 id='gender-ratio',
                 min=0, max=100, step=5, value=50,
                 marks={0: '0%', 25: '25%', 50: '50%', 75: '75%', 100: '100%'},
-                tooltip={'placement': 'bottom', 'always_visible': True}
+                tooltip={'placement': 'bottom', 'always_visible': True},
+                updatemode='mouseup'  # 드래그 중간값으로 콜백이 연쇄 호출되지 않도록
             ),
         ])
-    ], className='shadow-sm h-100', style={'borderRadius': '12px', 'border': 'none'})
+    ], className='shadow-sm h-100 card-medical')
 
 
 def create_physiology_card():
     """생리학적 파라미터 카드"""
     return dbc.Card([
         dbc.CardHeader([
-            html.H5("⚗️ 생리학적 파라미터", className='mb-0',
-                   style={'color': COLORS['primary'], 'fontWeight': '600'})
-        ], style={'backgroundColor': '#F1F5F9'}),
+            html.H5("⚗️ 생리학적 파라미터", className='mb-0 card-title-medical')
+        ], className='card-header-medical'),
         dbc.CardBody([
             dbc.Row([
                 dbc.Col([
                     html.Label("체중 평균 (kg)", className='fw-semibold text-muted'),
-                    dbc.Input(id='weight-mean', type='number', value=70, min=40, max=120,
+                    dbc.Input(id='weight-mean', type='number', debounce=True, value=70, min=40, max=120,
                              className='mb-2')
                 ], width=6),
                 dbc.Col([
                     html.Label("체중 SD (kg)", className='fw-semibold text-muted'),
-                    dbc.Input(id='weight-sd', type='number', value=15, min=5, max=30,
+                    dbc.Input(id='weight-sd', type='number', debounce=True, value=15, min=5, max=30,
                              className='mb-2')
                 ], width=6),
             ]),
             html.Hr(className='my-3'),
             html.Label("기저 간 청소율 CLint (L/h)", className='fw-semibold text-muted'),
-            dbc.Input(id='base-clint', type='number', value=10, min=1, max=100,
+            dbc.Input(id='base-clint', type='number', debounce=True, value=10, min=1, max=100,
                      className='mb-2'),
             html.Small("※ CYP2C19/3A4 유전자형에 따라 개인별로 조정됩니다", 
                       className='text-muted fst-italic')
         ])
-    ], className='shadow-sm h-100', style={'borderRadius': '12px', 'border': 'none'})
+    ], className='shadow-sm h-100 card-medical')
 
 
 def create_drug_card():
     """약물 파라미터 카드"""
     return dbc.Card([
         dbc.CardHeader([
-            html.H5("💊 약물 파라미터", className='mb-0',
-                   style={'color': COLORS['primary'], 'fontWeight': '600'})
-        ], style={'backgroundColor': '#F1F5F9'}),
+            html.H5("💊 약물 파라미터", className='mb-0 card-title-medical')
+        ], className='card-header-medical'),
         dbc.CardBody([
             # Drug Name with PubChem fetch
             html.Label("약물명", className='fw-semibold text-muted'),
@@ -211,44 +397,51 @@ def create_drug_card():
                 dbc.Input(id='drug-name', type='text', placeholder='예: Omeprazole'),
                 dbc.Button("🔍 PubChem", id='fetch-pubchem', color='info', size='sm')
             ], className='mb-2'),
-            html.Div(id='pubchem-status', className='mb-2'),
+            dcc.Loading(
+                id='loading-pubchem',
+                type='dot',
+                children=[
+                    html.Div(id='pubchem-status', className='mb-2'),
+                    dcc.Store(id='pubchem-data')  # PubChem 원본 응답 (상태 문구는 브라우저에서 생성)
+                ]
+            ),
             
             html.Hr(className='my-3'),
             
             dbc.Row([
                 dbc.Col([
                     html.Label("LogP", className='fw-semibold text-muted'),
-                    dbc.Input(id='log-p', type='number', value=2.0, step=0.1)
+                    dbc.Input(id='log-p', type='number', debounce=True, value=2.0, step=0.1)
                 ], width=6),
                 dbc.Col([
                     html.Label("f_u (비결합률)", className='fw-semibold text-muted'),
-                    dbc.Input(id='f-u', type='number', value=0.1, min=0, max=1, step=0.01)
+                    dbc.Input(id='f-u', type='number', debounce=True, value=0.1, min=0, max=1, step=0.01)
                 ], width=6),
             ], className='mb-2'),
             
             dbc.Row([
                 dbc.Col([
                     html.Label("Vd (L/kg)", className='fw-semibold text-muted'),
-                    dbc.Input(id='v-d', type='number', value=1.0, step=0.1)
+                    dbc.Input(id='v-d', type='number', debounce=True, value=1.0, step=0.1)
                 ], width=6),
                 dbc.Col([
                     html.Label("ka (1/h)", className='fw-semibold text-muted'),
-                    dbc.Input(id='k-a', type='number', value=1.0, step=0.1)
+                    dbc.Input(id='k-a', type='number', debounce=True, value=1.0, step=0.1)
                 ], width=6),
             ], className='mb-2'),
             
             dbc.Row([
                 dbc.Col([
                     html.Label("투여량 (mg)", className='fw-semibold text-muted'),
-                    dbc.Input(id='dose', type='number', value=100, min=1)
+                    dbc.Input(id='dose', type='number', debounce=True, value=100, min=1)
                 ], width=6),
                 dbc.Col([
                     html.Label("생체이용률 (F)", className='fw-semibold text-muted'),
-                    dbc.Input(id='bioavail', type='number', value=0.8, min=0, max=1, step=0.05)
+                    dbc.Input(id='bioavail', type='number', debounce=True, value=0.8, min=0, max=1, step=0.05)
                 ], width=6),
             ]),
         ])
-    ], className='shadow-sm h-100', style={'borderRadius': '12px', 'border': 'none'})
+    ], className='shadow-sm h-100 card-medical')
 
 
 def create_simulation_control():
@@ -258,18 +451,11 @@ def create_simulation_control():
             # Step 1: 인구집단 생성 버튼
             html.Label("Step 1: 가상 인구집단 생성", className='fw-semibold text-muted mb-2'),
             dbc.Button(
-                [html.Span("👥 ", style={'marginRight': '8px'}), "인구집단 생성"],
+                [html.Span("👥 ", className='btn-icon'), "인구집단 생성"],
                 id='generate-population',
                 color='primary',
                 size='lg',
-                className='w-100 fw-bold mb-2',
-                style={
-                    'background': f'linear-gradient(135deg, {COLORS["primary"]} 0%, #2C5282 100%)',
-                    'border': 'none',
-                    'borderRadius': '8px',
-                    'padding': '12px 24px',
-                    'boxShadow': '0 4px 15px rgba(30, 58, 95, 0.4)'
-                }
+                className='w-100 fw-bold mb-2 btn-gradient btn-primary-gradient'
             ),
             dcc.Loading(
                 id='loading-population',
@@ -282,19 +468,12 @@ def create_simulation_control():
             # Step 2: 시뮬레이션 실행 버튼
             html.Label("Step 2: 약물 시뮬레이션 실행", className='fw-semibold text-muted mb-2'),
             dbc.Button(
-                [html.Span("💊 ", style={'marginRight': '8px'}), "시뮬레이션 실행"],
+                [html.Span("💊 ", className='btn-icon'), "시뮬레이션 실행"],
                 id='run-simulation',
                 color='success',
                 size='lg',
-                className='w-100 fw-bold',
-                disabled=True,  # 인구집단 생성 전까지 비활성화
-                style={
-                    'background': f'linear-gradient(135deg, {COLORS["secondary"]} 0%, #27AE60 100%)',
-                    'border': 'none',
-                    'borderRadius': '8px',
-                    'padding': '12px 24px',
-                    'boxShadow': '0 4px 15px rgba(46, 204, 113, 0.4)'
-                }
+                className='w-100 fw-bold btn-gradient btn-success-gradient',
+                disabled=True  # 인구집단 생성 전까지 비활성화
             ),
             dcc.Loading(
                 id='loading-simulation',
@@ -302,204 +481,243 @@ def create_simulation_control():
                 children=html.Div(id='simulation-status', className='mt-2 text-center')
             )
         ])
-    ], className='shadow-sm', style={'borderRadius': '12px', 'border': 'none'})
+    ], className='shadow-sm card-medical')
+
+
+# PK 곡선 figure의 trace 순서 (Patch로 배열만 교체하므로 인덱스 고정)
+PK_TRACE_OVERLAY = 0
+PK_TRACE_CI_LOWER = 1
+PK_TRACE_CI_UPPER = 2
+PK_TRACE_MEDIAN = 3
+PK_TRACE_MEAN = 4
+
+
+def build_pk_template():
+    """PK 곡선 figure 템플릿 (빈 placeholder trace + 안내 문구)
+
+    레이아웃 생성 시 한 번만 만들고, 이후 콜백은 Patch로 trace의 x/y 배열과
+    안내 문구만 바꿉니다. trace 순서는 PK_TRACE_* 상수와 일치해야 합니다.
+    """
+    fig = go.Figure()
+    
+    # Individual curves (NaN 구분자로 이어 붙인 단일 WebGL trace, 토글 시에만 표시)
+    fig.add_trace(go.Scattergl(
+        x=[], y=[],
+        mode='lines',
+        line=dict(color='rgba(150, 150, 150, 0.2)', width=0.5),
+        name='Individual',
+        visible=False,
+        hoverinfo='skip'
+    ))
+    
+    # 90% 구간 밴드 (하한선 → 상한선 'tonexty' 채우기)
+    fig.add_trace(go.Scattergl(
+        x=[], y=[],
+        mode='lines',
+        line=dict(color='rgba(0,0,0,0)'),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    fig.add_trace(go.Scattergl(
+        x=[], y=[],
+        mode='lines',
+        fill='tonexty',
+        fillcolor='rgba(30, 58, 95, 0.2)',
+        line=dict(color='rgba(0,0,0,0)'),
+        name='90% CI',
+        hoverinfo='skip'
+    ))
+    
+    # Median curve
+    fig.add_trace(go.Scattergl(
+        x=[], y=[],
+        mode='lines',
+        line=dict(color=COLORS['primary'], width=3),
+        name='집단 중앙값'
+    ))
+    
+    # Mean curve (참고용 점선)
+    fig.add_trace(go.Scattergl(
+        x=[], y=[],
+        mode='lines',
+        line=dict(color=COLORS['primary'], width=1.5, dash='dash'),
+        name='집단 평균'
+    ))
+    
+    fig.add_annotation(
+        text="시뮬레이션을 실행하세요",
+        xref="paper", yref="paper",
+        x=0.5, y=0.5, showarrow=False,
+        font=dict(size=16, color=COLORS['text_muted'])
+    )
+    
+    fig.update_layout(
+        template='plotly_white',
+        xaxis_title='시간 (h)',
+        yaxis_title='혈장 농도 (ng/mL)',
+        legend=dict(
+            orientation='h',
+            yanchor='bottom',
+            y=1.02,
+            xanchor='right',
+            x=1
+        ),
+        margin=dict(l=60, r=40, t=60, b=60),
+        hovermode='x unified'
+    )
+    
+    return fig
 
 
 def create_pk_curves_card():
     """PK 곡선 시각화 카드"""
     return dbc.Card([
         dbc.CardHeader([
-            html.H5("📈 혈장 농도-시간 곡선", className='mb-0',
-                   style={'color': COLORS['primary'], 'fontWeight': '600'})
-        ], style={'backgroundColor': '#F1F5F9'}),
+            html.H5("📈 혈장 농도-시간 곡선", className='mb-0 card-title-medical')
+        ], className='card-header-medical'),
         dbc.CardBody([
+            dbc.Switch(
+                id='pk-show-individuals',
+                label='개인별 곡선 표시',
+                value=False,
+                className='mb-2'
+            ),
             dcc.Graph(
                 id='pk-curves',
+                figure=build_pk_template(),
                 config={'displayModeBar': True, 'responsive': True},
-                style={'height': '400px'}
+                className='graph-lg'
             )
         ])
-    ], className='shadow-sm', style={'borderRadius': '12px', 'border': 'none'})
+    ], className='shadow-sm card-medical')
 
 
 def create_safety_card():
     """안전 마진 분석 카드"""
     return dbc.Card([
         dbc.CardHeader([
-            html.H5("⚠️ 안전 마진 분석", className='mb-0',
-                   style={'color': COLORS['primary'], 'fontWeight': '600'})
-        ], style={'backgroundColor': '#F1F5F9'}),
+            html.H5("⚠️ 안전 마진 분석", className='mb-0 card-title-medical')
+        ], className='card-header-medical'),
         dbc.CardBody([
             html.Label("독성 임계값 (ng/mL)", className='fw-semibold text-muted'),
-            dbc.Input(id='toxic-threshold', type='number', value=1000, min=1,
+            dbc.Input(id='toxic-threshold', type='number', debounce=True, value=1000, min=1,
                      className='mb-3'),
             html.Div(id='safety-report', className='mt-3'),
             dcc.Graph(
                 id='cmax-histogram',
                 config={'displayModeBar': False, 'responsive': True},
-                style={'height': '250px'}
+                className='graph-sm'
             )
         ])
-    ], className='shadow-sm', style={'borderRadius': '12px', 'border': 'none'})
+    ], className='shadow-sm card-medical')
 
 
 def create_population_summary_card():
     """인구집단 요약 카드"""
     return dbc.Card([
         dbc.CardHeader([
-            html.H5("📊 인구집단 요약", className='mb-0',
-                   style={'color': COLORS['primary'], 'fontWeight': '600'})
-        ], style={'backgroundColor': '#F1F5F9'}),
+            html.H5("📊 인구집단 요약", className='mb-0 card-title-medical')
+        ], className='card-header-medical'),
         dbc.CardBody([
             html.Div(id='population-summary'),
             dcc.Graph(
                 id='metabolizer-pie',
                 config={'displayModeBar': False, 'responsive': True},
-                style={'height': '250px'}
+                className='graph-sm'
             )
         ])
-    ], className='shadow-sm', style={'borderRadius': '12px', 'border': 'none'})
+    ], className='shadow-sm card-medical')
 
 
 def create_digital_twin_card():
-    """디지털 트윈 시각화 카드 - 사람 모양 아이콘으로 인구집단 표시"""
+    """디지털 트윈 시각화 카드 - 대사자 표현형별 색상 마커로 인구집단 표시"""
     return dbc.Card([
         dbc.CardHeader([
-            html.H5("🧬 디지털 트윈 인구집단", className='mb-0',
-                   style={'color': COLORS['primary'], 'fontWeight': '600'}),
-        ], style={'backgroundColor': '#F1F5F9'}),
+            html.H5("🧬 디지털 트윈 인구집단", className='mb-0 card-title-medical'),
+        ], className='card-header-medical'),
         dbc.CardBody([
             # 범례
             html.Div([
                 html.Span("대사자 표현형: ", className='fw-semibold me-2'),
-                html.Span("🟢 NM", className='me-2', style={'fontSize': '0.85rem'}),
-                html.Span("🟡 IM", className='me-2', style={'fontSize': '0.85rem'}),
-                html.Span("🔴 PM", className='me-2', style={'fontSize': '0.85rem'}),
-                html.Span("🔵 UM", style={'fontSize': '0.85rem'}),
-            ], className='mb-3 text-muted', style={'fontSize': '0.9rem'}),
+                html.Span("🟢 NM", className='me-2 legend-item'),
+                html.Span("🟡 IM", className='me-2 legend-item'),
+                html.Span("🔴 PM", className='me-2 legend-item'),
+                html.Span("🔵 UM", className='me-3 legend-item'),
+                html.Span("● 남  ◆ 여", className='legend-item'),
+                dbc.Switch(id='twin-full', label='전체 표시', value=False,
+                           className='ms-auto mb-0 legend-item'),
+            ], className='mb-3 text-muted legend-row d-flex align-items-center'),
             
-            # 디지털 트윈 그리드 컨테이너
-            html.Div(
-                id='digital-twin-grid',
-                style={
-                    'display': 'flex',
-                    'flexWrap': 'wrap',
-                    'gap': '4px',
-                    'justifyContent': 'center',
-                    'maxHeight': '350px',
-                    'overflowY': 'auto',
-                    'padding': '10px',
-                    'backgroundColor': '#F8FAFC',
-                    'borderRadius': '8px'
-                }
+            # 디지털 트윈 산점도 (전체 인원을 WebGL 마커 하나의 trace로 표시)
+            dcc.Graph(
+                id='digital-twin-graph',
+                config={'displayModeBar': False, 'responsive': True},
+                className='graph-md'
             ),
             
             # 선택된 개인 정보 표시
             html.Div(id='selected-individual-info', className='mt-3')
         ])
-    ], className='shadow-sm', style={'borderRadius': '12px', 'border': 'none'})
-
-
-def create_person_icon(individual_data: dict, index: int) -> html.Div:
-    """개인을 나타내는 사람 모양 아이콘 생성
-    
-    Args:
-        individual_data: 개인 정보 딕셔너리
-        index: 개인 인덱스
-        
-    Returns:
-        html.Div 컴포넌트
-    """
-    # 대사자 표현형에 따른 색상
-    metabolizer = individual_data.get('metabolizer', 'NM')
-    gender = individual_data.get('gender', 'M')
-    
-    color_map = {
-        'PM': '#E74C3C',   # 빨강
-        'IM': '#F39C12',   # 노랑
-        'NM': '#2ECC71',   # 초록
-        'UM': '#3498DB'    # 파랑
-    }
-    color = color_map.get(metabolizer, '#2ECC71')
-    
-    # 성별에 따른 아이콘 (SVG)
-    if gender == 'M':
-        icon = '👨'
-    else:
-        icon = '👩'
-    
-    # 툴팁 텍스트
-    age = individual_data.get('age', 0)
-    weight = individual_data.get('weight', 0)
-    ethnicity = individual_data.get('ethnicity', '')
-    
-    tooltip_text = f"ID: {index+1}\n나이: {age}세\n체중: {weight:.1f}kg\n민족: {ethnicity}\n표현형: {metabolizer}"
-    
-    return html.Div(
-        icon,
-        id={'type': 'person-icon', 'index': index},
-        title=tooltip_text,
-        style={
-            'width': '28px',
-            'height': '28px',
-            'display': 'flex',
-            'alignItems': 'center',
-            'justifyContent': 'center',
-            'fontSize': '18px',
-            'backgroundColor': color,
-            'borderRadius': '50%',
-            'cursor': 'pointer',
-            'transition': 'transform 0.2s, box-shadow 0.2s',
-            'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'
-        },
-        className='person-icon'
-    )
+    ], className='shadow-sm card-medical')
 
 
 # ============================================================================
 # Main Layout
 # ============================================================================
 
+# 정적 UI 컴포넌트는 import 시점에 한 번만 생성하여 상수로 고정
+# ※ create_* 팩토리는 콜백 안에서 호출하지 마세요. 레이아웃은 정적,
+#   콜백은 동적 값(figure/children/data)만 갱신하는 구조를 유지합니다.
+HEADER = create_header()
+POPULATION_CARD = create_population_card()
+PHYSIOLOGY_CARD = create_physiology_card()
+DRUG_CARD = create_drug_card()
+SIMULATION_CONTROL = create_simulation_control()
+DIGITAL_TWIN_CARD = create_digital_twin_card()
+PK_CURVES_CARD = create_pk_curves_card()
+SAFETY_CARD = create_safety_card()
+POPULATION_SUMMARY_CARD = create_population_summary_card()
+
 app.layout = html.Div([
-    create_header(),
+    HEADER,
     
     dbc.Container([
         dbc.Row([
             # Left Panel - Input Controls
             dbc.Col([
-                create_population_card(),
+                POPULATION_CARD,
                 html.Div(className='mb-3'),
-                create_physiology_card(),
+                PHYSIOLOGY_CARD,
                 html.Div(className='mb-3'),
-                create_drug_card(),
+                DRUG_CARD,
                 html.Div(className='mb-3'),
-                create_simulation_control(),
+                SIMULATION_CONTROL,
             ], lg=4, md=5, className='mb-4'),
             
             # Right Panel - Visualizations
             dbc.Col([
                 # 디지털 트윈 시각화 (상단)
-                create_digital_twin_card(),
+                DIGITAL_TWIN_CARD,
                 html.Div(className='mb-3'),
                 
                 # PK 곡선 (중단)
-                create_pk_curves_card(),
+                PK_CURVES_CARD,
                 html.Div(className='mb-3'),
                 
                 # 하단 패널들
                 dbc.Row([
-                    dbc.Col([create_safety_card()], lg=6),
-                    dbc.Col([create_population_summary_card()], lg=6),
+                    dbc.Col([SAFETY_CARD], lg=6),
+                    dbc.Col([POPULATION_SUMMARY_CARD], lg=6),
                 ])
             ], lg=8, md=7),
         ])
-    ], fluid=True, style={'maxWidth': '1600px'}),
+    ], fluid=True, className='app-container'),
     
     # Store for simulation results
-    dcc.Store(id='simulation-results'),
-    dcc.Store(id='population-individuals'),  # 개인별 데이터 저장
+    dcc.Store(id='simulation-results'),  # 서버 캐시 조회 키만 저장
+    dcc.Store(id='population-individuals'),  # 인구집단 조회 키 + 요약 (배열은 서버 캐시)
     
-], style={'backgroundColor': COLORS['background'], 'minHeight': '100vh', 'paddingBottom': '50px'})
+], className='app-root')
 
 
 # ============================================================================
@@ -507,35 +725,56 @@ app.layout = html.Div([
 # ============================================================================
 
 @callback(
-    [Output('pubchem-status', 'children'),
+    [Output('pubchem-data', 'data'),
      Output('log-p', 'value')],
     Input('fetch-pubchem', 'n_clicks'),
     State('drug-name', 'value'),
+    # 조회 중에는 버튼을 잠가 중복 요청(연타)이 쌓이지 않도록 함
+    running=[(Output('fetch-pubchem', 'disabled'), True, False)],
     prevent_initial_call=True
 )
 def fetch_drug_data(n_clicks, drug_name):
-    """PubChem에서 약물 데이터 가져오기"""
+    """PubChem에서 약물 데이터 가져오기
+
+    상태 문구는 아래 clientside 콜백이 pubchem-data로부터 만들어 표시합니다.
+    """
+    # 빈 입력(공백 포함)은 PubChem을 호출하지 않고 출력도 그대로 둠
+    drug_name = (drug_name or '').strip()
     if not drug_name:
-        return dbc.Alert("약물명을 입력하세요", color='warning', className='py-1 mb-0'), 2.0
+        raise PreventUpdate
     
     data = fetch_pubchem_data(drug_name)
+    data['name'] = drug_name
     
     if data['found']:
-        return (
-            dbc.Alert(
-                f"✓ {drug_name} 발견 (MW: {data['mw']:.1f})",
-                color='success', className='py-1 mb-0'
-            ),
-            round(data['log_p'], 2)
-        )
+        return data, round(data['log_p'], 2)
     else:
-        return dbc.Alert("약물을 찾을 수 없습니다", color='danger', className='py-1 mb-0'), 2.0
+        return data, 2.0
+
+
+# PubChem 결과 → 상태 문구 (서버 왕복 없이 브라우저에서 포맷)
+app.clientside_callback(
+    """
+    function(data) {
+        if (!data) {
+            return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+        }
+        if (data.found) {
+            return ['✓ ' + data.name + ' 발견 (MW: ' + data.mw.toFixed(1) + ')',
+                    'mb-2 alert alert-success py-1'];
+        }
+        return ['약물을 찾을 수 없습니다', 'mb-2 alert alert-danger py-1'];
+    }
+    """,
+    [Output('pubchem-status', 'children'),
+     Output('pubchem-status', 'className')],
+    Input('pubchem-data', 'data')
+)
 
 
 @callback(
     [Output('population-individuals', 'data'),
-     Output('population-status', 'children'),
-     Output('run-simulation', 'disabled')],
+     Output('population-status', 'children')],
     Input('generate-population', 'n_clicks'),
     [State('n-subjects', 'value'),
      State('eth-asian', 'value'),
@@ -552,15 +791,11 @@ def generate_population(n_clicks, n_subjects, eth_asian, eth_european, eth_afric
                         age_range, gender_ratio, weight_mean, weight_sd, base_clint):
     """Step 1: 가상 인구집단 생성"""
     
-    # Normalize ethnicity percentages
-    total_eth = eth_asian + eth_european + eth_african
-    if total_eth == 0:
-        total_eth = 100
-    
+    # 민족 비율(%)은 PopulationGenerator가 정규화 (모두 0이면 균등 배분)
     ethnicity_dist = {
-        Ethnicity.EAST_ASIAN: eth_asian / total_eth,
-        Ethnicity.EUROPEAN: eth_european / total_eth,
-        Ethnicity.AFRICAN: eth_african / total_eth
+        Ethnicity.EAST_ASIAN: eth_asian or 0,
+        Ethnicity.EUROPEAN: eth_european or 0,
+        Ethnicity.AFRICAN: eth_african or 0
     }
     
     # Generate population
@@ -575,46 +810,32 @@ def generate_population(n_clicks, n_subjects, eth_asian, eth_european, eth_afric
         random_seed=None  # 매번 다른 인구집단 생성
     )
     
-    population = generator.generate()
-    pop_summary = generator.get_population_summary(population)
+    population = generator.generate_arrays()
+    pop_summary = generator.get_array_summary(population)
     
     # 개인별 데이터 저장 (디지털 트윈 + 시뮬레이션용)
-    individuals_data = []
-    for ind in population:
-        # 대사자 표현형 약여
-        metabolizer_map = {
-            'Poor Metabolizer (PM)': 'PM',
-            'Intermediate Metabolizer (IM)': 'IM',
-            'Normal Metabolizer (NM)': 'NM',
-            'Ultra-rapid Metabolizer (UM)': 'UM'
-        }
-        individuals_data.append({
-            'id': ind.subject_id,
-            'age': ind.age,
-            'gender': ind.gender,
-            'weight': round(ind.weight, 1),
-            'height': round(ind.height, 1),
-            'bmi': round(ind.bmi, 1),
-            'ethnicity': ind.ethnicity.value,
-            'metabolizer': metabolizer_map.get(ind.metabolizer_status.value, 'NM'),
-            'activity_score': round(ind.combined_activity_score, 2),
-            'cyp2c19': '/'.join(ind.cyp2c19_genotype),
-            'cyp3a4': '/'.join(ind.cyp3a4_genotype),
-            # 생리학적 파라미터도 저장 (시뮬레이션용)
-            'phys_params': {
-                'body_weight': ind.phys_params.body_weight,
-                'v_plasma': ind.phys_params.v_plasma,
-                'v_liver': ind.phys_params.v_liver,
-                'q_liver': ind.phys_params.q_liver,
-                'cl_int': ind.phys_params.cl_int,
-                'cl_renal': ind.phys_params.cl_renal,
-                'activity_score': ind.phys_params.activity_score
-            }
-        })
-    
-    # pop_summary도 함께 저장
+    # 필드별 배열(float32/uint8)은 서버 캐시에 두고 Store에는 조회 키만 저장하여
+    # 시뮬레이션·그리드 콜백마다 인구집단 전체가 브라우저 ↔ 서버를 오가지 않도록 함
+    columns = {
+        'id': population['subject_id'],
+        'age': population['age'].astype(np.uint8),
+        'gender': (population['gender'] == 'M').astype(np.uint8),   # 1 = 남성, 0 = 여성
+        'weight': population['weight'].astype(np.float32),
+        'height': population['height'].astype(np.float32),
+        'bmi': population['bmi'].astype(np.float32),
+        'eth': population['ethnicity'].astype(np.uint8),        # ETHNICITY_ORDER 인덱스
+        'metab': population['metabolizer'].astype(np.uint8),    # METABOLIZER_LABELS 인덱스
+        'activity_score': population['combined_activity_score'].astype(np.float32),
+        'cyp2c19': population['cyp2c19_diplotype'],
+        'cyp3a4': population['cyp3a4_diplotype'],
+        # 생리학적 파라미터 (시뮬레이션용, PHYS_DTYPE float32 구조화 배열 그대로)
+        'phys': population['phys'],
+    }
+    
     result_data = {
-        'individuals': individuals_data,
+        'key': cache_population(columns),
+        'n': int(n_subjects),
+        # pop_summary도 함께 저장
         'summary': pop_summary
     }
     
@@ -623,8 +844,20 @@ def generate_population(n_clicks, n_subjects, eth_asian, eth_european, eth_afric
         color='success', className='py-1 mb-0'
     )
     
-    # 시뮬레이션 버튼 활성화 (disabled=False)
-    return result_data, status, False
+    # 시뮬레이션 버튼 활성화는 아래 clientside 콜백이 담당
+    return result_data, status
+
+
+# 인구집단이 생성되면 시뮬레이션 버튼 활성화 (브라우저에서 즉시 처리)
+app.clientside_callback(
+    """
+    function(popData) {
+        return popData ? false : true;
+    }
+    """,
+    Output('run-simulation', 'disabled'),
+    Input('population-individuals', 'data')
+)
 
 
 @callback(
@@ -647,10 +880,10 @@ def run_drug_simulation(n_clicks, population_data, drug_name, log_p, f_u, v_d, k
     if population_data is None:
         return None, dbc.Alert("먼저 인구집단을 생성하세요!", color='warning', className='py-1 mb-0')
     
-    individuals = population_data.get('individuals', [])
     pop_summary = population_data.get('summary', {})
+    n_individuals = population_data.get('n', 0)
     
-    if not individuals:
+    if n_individuals == 0:
         return None, dbc.Alert("인구집단 데이터가 없습니다.", color='danger', className='py-1 mb-0')
     
     # Drug parameters
@@ -671,137 +904,103 @@ def run_drug_simulation(n_clicks, population_data, drug_name, log_p, f_u, v_d, k
         n_points=241
     )
     
-    # 저장된 생리학적 파라미터로 PhysiologicalParameters 객체 생성
-    population_phys = []
-    for ind in individuals:
-        phys = ind.get('phys_params', {})
-        population_phys.append(PhysiologicalParameters(
-            body_weight=phys.get('body_weight', 70),
-            v_plasma=phys.get('v_plasma', 3.0),
-            v_liver=phys.get('v_liver', 1.5),
-            q_liver=phys.get('q_liver', 90),
-            cl_int=phys.get('cl_int', 10),
-            cl_renal=phys.get('cl_renal', 0),
-            activity_score=phys.get('activity_score', 1.0)
-        ))
-    
-    # Run population simulation
-    sim_results = run_population_simulation(drug_params, population_phys, sim_config)
-    
-    # Prepare data for storage
-    results = {
-        'time': sim_results['time'].tolist(),
-        'mean_concentration': sim_results['mean_concentration'].tolist(),
-        'ci_lower': sim_results['ci_lower'].tolist(),
-        'ci_upper': sim_results['ci_upper'].tolist(),
-        'individual_curves': sim_results['individual_curves'][:50].tolist(),
-        'cmax_distribution': sim_results['cmax_distribution'].tolist(),
-        'auc_distribution': sim_results['auc_distribution'].tolist(),
-        'pop_summary': pop_summary
+    pop = get_population(population_data['key'])
+    if pop is None:
+        return None, dbc.Alert("인구집단 데이터가 만료되었습니다. 다시 생성하세요.",
+                               color='warning', className='py-1 mb-0')
+    
+    # 저장된 생리학적 파라미터 구조화 배열을 그대로 시뮬레이션에 전달
+    # 요청 핸들러(멀티스레드 서버)에서는 프로세스 풀 없이 순차 일괄 풀이
+    sim_results = run_population_simulation(drug_params, pop['phys'], sim_config, n_workers=1)
+    
+    # 결과 배열은 서버 캐시에 NumPy 그대로 보관하고 Store에는 키만 전달
+    # 시각화용 농도는 유효숫자 3~4자리면 충분하므로 float32로 줄여 저장
+    # (Plotly가 float32 배열을 base64 typed array로 직렬화 → 전송량도 절반)
+    # 중앙값/Cmax/AUC는 시뮬레이션에서 이미 계산되므로 개인별 곡선은 오버레이용만 보관
+    cached = {
+        name: np.asarray(sim_results[name], dtype=np.float32)
+        for name in ('time', 'mean_concentration', 'median_concentration',
+                     'ci_lower', 'ci_upper', 'cmax_distribution', 'auc_distribution')
     }
+    # (슬라이스 view가 전체 (N, T) 곡선 배열을 캐시에 붙잡아 두지 않도록 복사)
+    cached['individual_curves'] = np.array(
+        sim_results['individual_curves'][:PK_OVERLAY_LIMIT], dtype=np.float32
+    )
+    cached['pop_summary'] = pop_summary
+    key = cache_simulation_result(cached)
+    results = {'key': key}
     
     status = dbc.Alert(
-        f"✓ {len(individuals)}명 대상 '{drug_name or 'Drug'}' 시뮬레이션 완료!",
+        f"✓ {n_individuals}명 대상 '{drug_name or 'Drug'}' 시뮬레이션 완료!",
         color='success', className='py-1 mb-0'
     )
     
     return results, status
 
 
-@callback(
-    Output('pk-curves', 'figure'),
-    Input('simulation-results', 'data')
-)
-def update_pk_curves(results):
-    """PK 곡선 업데이트"""
-    
-    if results is None:
-        # Empty plot
-        fig = go.Figure()
-        fig.add_annotation(
-            text="시뮬레이션을 실행하세요",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color=COLORS['text_muted'])
-        )
-        fig.update_layout(
-            template='plotly_white',
-            margin=dict(l=40, r=40, t=40, b=40)
-        )
-        return fig
-    
-    time = results['time']
-    mean_conc = results['mean_concentration']
-    ci_lower = results['ci_lower']
-    ci_upper = results['ci_upper']
-    individual_curves = results['individual_curves']
-    
-    fig = go.Figure()
+def typed_array_spec(values):
+    """배열 → Plotly.js typed array spec ({'dtype': 'f4', 'bdata': base64})
+
+    Patch 연산 값은 Plotly 인코더를 거치지 않아 그대로 두면 float 리스트로
+    풀려 나가므로, float32 바이트를 직접 base64로 담아 보냅니다.
+    브라우저는 이를 Float32Array로 바로 읽어 별도의 배열 복사가 없습니다.
+    """
+    arr = np.ascontiguousarray(values, dtype=np.float32)
+    if arr.size == 0:
+        return []
+    
+    spec = {'dtype': 'f4', 'bdata': base64.b64encode(arr.tobytes()).decode('ascii')}
+    if arr.ndim > 1:
+        spec['shape'] = ', '.join(map(str, arr.shape))
+    return spec
+
+
+def pk_overlay_arrays(time, individual_curves):
+    """개인별 곡선을 시간축으로 솎아 NaN 구분자로 이어 붙인 (x, y) 배열 생성"""
+    time_ds = time[::PK_OVERLAY_STRIDE]
+    curves_ds = individual_curves[:PK_OVERLAY_LIMIT, ::PK_OVERLAY_STRIDE]
+    n_curves = curves_ds.shape[0]
+    
+    gap = np.full((n_curves, 1), np.nan, dtype=curves_ds.dtype)
+    x = np.tile(np.append(time_ds, np.nan).astype(curves_ds.dtype), n_curves)
+    y = np.hstack([curves_ds, gap]).ravel()
+    return x, y
+
+
+def build_pk_patch(results, show_individuals):
+    """PK 곡선 Patch 생성 (build_pk_template의 trace 배열만 교체)
+
+    중앙값과 5~95 백분위 밴드는 전체 해상도로, 개인별 곡선은
+    PK_OVERLAY_STRIDE 간격으로 솎아서 함께 보냅니다.
+    개인별 곡선 표시 토글은 브라우저(assets/pk.js)에서 visible만 바꿉니다.
+    """
+    patched = Patch()
     
-    # Individual curves (subset)
-    for i, curve in enumerate(individual_curves[:30]):
-        fig.add_trace(go.Scatter(
-            x=time, y=curve,
-            mode='lines',
-            line=dict(color='rgba(150, 150, 150, 0.2)', width=0.5),
-            name='Individual' if i == 0 else None,
-            showlegend=(i == 0),
-            hoverinfo='skip'
-        ))
-    
-    # 90% CI band
-    fig.add_trace(go.Scatter(
-        x=time + time[::-1],
-        y=ci_upper + ci_lower[::-1],
-        fill='toself',
-        fillcolor='rgba(30, 58, 95, 0.2)',
-        line=dict(color='rgba(0,0,0,0)'),
-        name='90% CI',
-        hoverinfo='skip'
-    ))
+    overlay = patched['data'][PK_TRACE_OVERLAY]
+    overlay['visible'] = bool(show_individuals)
+    x, y = pk_overlay_arrays(results['time'], results['individual_curves'])
+    overlay['x'], overlay['y'] = typed_array_spec(x), typed_array_spec(y)
     
-    # Mean curve
-    fig.add_trace(go.Scatter(
-        x=time, y=mean_conc,
-        mode='lines',
-        line=dict(color=COLORS['primary'], width=3),
-        name='집단 평균'
-    ))
+    time = typed_array_spec(results['time'])
+    for index, name in ((PK_TRACE_CI_LOWER, 'ci_lower'),
+                        (PK_TRACE_CI_UPPER, 'ci_upper'),
+                        (PK_TRACE_MEDIAN, 'median_concentration'),
+                        (PK_TRACE_MEAN, 'mean_concentration')):
+        patched['data'][index]['x'] = time
+        patched['data'][index]['y'] = typed_array_spec(results[name])
     
-    fig.update_layout(
-        template='plotly_white',
-        xaxis_title='시간 (h)',
-        yaxis_title='혈장 농도 (ng/mL)',
-        legend=dict(
-            orientation='h',
-            yanchor='bottom',
-            y=1.02,
-            xanchor='right',
-            x=1
-        ),
-        margin=dict(l=60, r=40, t=60, b=60),
-        hovermode='x unified'
-    )
+    # "시뮬레이션을 실행하세요" 안내 문구 제거
+    patched['layout']['annotations'] = []
     
-    return fig
+    return patched
 
 
-@callback(
-    [Output('safety-report', 'children'),
-     Output('cmax-histogram', 'figure')],
-    [Input('simulation-results', 'data'),
-     Input('toxic-threshold', 'value')]
-)
-def update_safety_analysis(results, toxic_threshold):
-    """안전 마진 분석 업데이트"""
-    
-    empty_fig = go.Figure()
-    empty_fig.update_layout(template='plotly_white', margin=dict(l=40, r=40, t=20, b=40))
+def build_safety_report(cmax_dist, toxic_threshold):
+    """안전 마진 보고서 생성 (cmax_dist가 None이면 대기 상태)"""
     
-    if results is None:
-        return html.Div("시뮬레이션 결과 대기 중...", className='text-muted'), empty_fig
+    if cmax_dist is None:
+        return html.Div("시뮬레이션 결과 대기 중...", className='text-muted')
     
-    cmax_dist = np.array(results['cmax_distribution'])
     safety = calculate_safety_margin(cmax_dist, toxic_threshold)
     
     # Safety report
@@ -832,7 +1031,21 @@ def update_safety_analysis(results, toxic_threshold):
         ], className='mb-0')
     ], color=alert_color, className='mb-0')
     
-    # Histogram
+    return report
+
+
+def build_cmax_histogram(cmax_dist, toxic_threshold):
+    """Cmax 히스토그램 + 독성 임계값 선 생성 (cmax_dist가 None이면 빈 figure)
+
+    임계값 선은 shapes[0] / annotations[0]에 위치하며,
+    임계값 변경 시 assets/pk.js가 이 좌표만 옮깁니다.
+    """
+    
+    if cmax_dist is None:
+        empty_fig = go.Figure()
+        empty_fig.update_layout(template='plotly_white', margin=dict(l=40, r=40, t=20, b=40))
+        return empty_fig
+    
     fig = go.Figure()
     fig.add_trace(go.Histogram(
         x=cmax_dist,
@@ -859,25 +1072,18 @@ def update_safety_analysis(results, toxic_threshold):
         showlegend=False
     )
     
-    return report, fig
+    return fig
 
 
-@callback(
-    [Output('population-summary', 'children'),
-     Output('metabolizer-pie', 'figure')],
-    Input('simulation-results', 'data')
-)
-def update_population_summary(results):
-    """인구집단 요약 업데이트"""
+def build_population_summary_views(summary):
+    """인구집단 요약 배지 + 대사자 표현형 파이 차트 생성 (summary가 None이면 대기 상태)"""
     
     empty_fig = go.Figure()
     empty_fig.update_layout(template='plotly_white', margin=dict(l=20, r=20, t=20, b=20))
     
-    if results is None:
+    if summary is None:
         return html.Div("시뮬레이션 결과 대기 중...", className='text-muted'), empty_fig
     
-    summary = results['pop_summary']
-    
     # Summary badges
     summary_div = html.Div([
         dbc.Badge(f"N = {summary['n_subjects']}", color='primary', className='me-1 mb-1'),
@@ -927,85 +1133,205 @@ def update_population_summary(results):
 
 
 @callback(
-    Output('digital-twin-grid', 'children'),
-    Input('population-individuals', 'data')
+    [Output('pk-curves', 'figure'),
+     Output('cmax-histogram', 'figure'),
+     Output('metabolizer-pie', 'figure'),
+     Output('population-summary', 'children')],
+    Input('simulation-results', 'data'),
+    [State('toxic-threshold', 'value'),
+     State('pk-show-individuals', 'value')]
 )
-def update_digital_twin_grid(population_data):
-    """디지털 트윈 그리드 업데이트 - 사람 모양 아이콘으로 인구집단 시각화"""
+def update_result_views(results, toxic_threshold, show_individuals):
+    """시뮬레이션 결과 → PK 곡선 / Cmax 히스토그램 / 인구집단 요약 일괄 업데이트
+
+    Store에는 조회 키만 있으므로 서버 캐시에서 NumPy 배열을 직접 꺼내
+    출력을 생성합니다. (결과가 만료되었으면 대기 상태로 표시)
+    개인별 곡선 토글과 임계값 선 이동은 아래 clientside 콜백이 처리하므로
+    이 콜백은 새 결과가 들어올 때만 실행됩니다.
+    """
+    if results is not None:
+        results = get_simulation_result(results['key'])
     
-    if population_data is None:
-        return html.Div([
-            html.P("👆 Step 1: '인구집단 생성' 버튼을 클릭하세요",
-                  className='text-muted text-center py-5',
-                  style={'fontSize': '1.1rem'})
-        ])
+    if results is None:
+        summary_div, pie_fig = build_population_summary_views(None)
+        return build_pk_template(), build_cmax_histogram(None, toxic_threshold), pie_fig, summary_div
     
-    # 새 데이터 구조에서 individuals 추출
-    individuals = population_data.get('individuals', [])
+    pk_patch = build_pk_patch(results, show_individuals)
+    hist_fig = build_cmax_histogram(results['cmax_distribution'], toxic_threshold)
+    summary_div, pie_fig = build_population_summary_views(results['pop_summary'])
     
-    if not individuals:
-        return html.Div([
-            html.P("인구집단 데이터가 없습니다.", className='text-muted text-center py-5')
-        ])
+    return pk_patch, hist_fig, pie_fig, summary_div
+
+
+@callback(
+    Output('safety-report', 'children'),
+    [Input('simulation-results', 'data'),
+     Input('toxic-threshold', 'value')]
+)
+def update_safety_report(results, toxic_threshold):
+    """안전 마진 보고서 업데이트 (초과 비율 계산에 전체 Cmax 분포가 필요하므로 서버에서 처리)"""
+    if results is not None:
+        results = get_simulation_result(results['key'])
     
-    # 최대 200명까지만 표시 (성능 고려)
-    display_limit = min(200, len(individuals))
-    
-    icons = []
-    for i, ind in enumerate(individuals[:display_limit]):
-        # 대사자 표현형에 따른 색상
-        metabolizer = ind.get('metabolizer', 'NM')
-        gender = ind.get('gender', 'M')
-        
-        color_map = {
-            'PM': '#E74C3C',   # 빨강
-            'IM': '#F39C12',   # 노랑
-            'NM': '#2ECC71',   # 초록
-            'UM': '#3498DB'    # 파랑
-        }
-        color = color_map.get(metabolizer, '#2ECC71')
-        
-        # 성별에 따른 아이콘
-        icon = '👨' if gender == 'M' else '👩'
-        
-        # 툴팁
-        tooltip = f"ID: {ind['id']} | {ind['age']}세 | {ind['weight']}kg | {ind['ethnicity']} | {metabolizer}"
-        
-        icons.append(
-            html.Div(
-                icon,
-                title=tooltip,
-                style={
-                    'width': '26px',
-                    'height': '26px',
-                    'display': 'flex',
-                    'alignItems': 'center',
-                    'justifyContent': 'center',
-                    'fontSize': '14px',
-                    'backgroundColor': color,
-                    'borderRadius': '50%',
-                    'cursor': 'pointer',
-                    'transition': 'transform 0.2s',
-                    'boxShadow': '0 1px 3px rgba(0,0,0,0.15)'
-                }
-            )
+    if results is None or toxic_threshold is None:
+        return build_safety_report(None, toxic_threshold)
+    
+    return build_safety_report(results['cmax_distribution'], toxic_threshold)
+
+
+# 개인별 곡선 표시 토글 → overlay trace의 visible만 변경 (서버 왕복 없음)
+app.clientside_callback(
+    ClientsideFunction(namespace='pk', function_name='toggleIndividuals'),
+    Output('pk-curves', 'figure', allow_duplicate=True),
+    Input('pk-show-individuals', 'value'),
+    State('pk-curves', 'figure'),
+    prevent_initial_call=True
+)
+
+
+# 독성 임계값 변경 → 히스토그램의 임계값 선/주석 위치만 이동 (서버 왕복 없음)
+app.clientside_callback(
+    ClientsideFunction(namespace='pk', function_name='moveThreshold'),
+    Output('cmax-histogram', 'figure', allow_duplicate=True),
+    Input('toxic-threshold', 'value'),
+    State('cmax-histogram', 'figure'),
+    prevent_initial_call=True
+)
+
+
+@callback(
+    Output('digital-twin-graph', 'figure'),
+    [Input('population-individuals', 'data'),
+     Input('twin-full', 'value')]
+)
+def update_digital_twin_grid(population_data, show_all):
+    """디지털 트윈 그리드 업데이트 - 인구집단을 Scattergl 마커 격자로 시각화
+
+    개인마다 html.Div를 만드는 대신 좌표/색상/툴팁 배열만 가진
+    단일 figure를 반환하여 서버 직렬화와 브라우저 DOM 비용을 줄입니다.
+    N이 TWIN_SAMPLE_LIMIT를 넘으면 '전체 표시'를 켜기 전까지
+    대사자 표현형별 층화 표본만 그려 초기 렌더링 비용을 일정하게 유지합니다.
+    """
+    n = (population_data or {}).get('n', 0)
+    
+    if n == 0 or get_population(population_data['key']) is None:
+        message = ("👆 Step 1: '인구집단 생성' 버튼을 클릭하세요" if population_data is None
+                   else "인구집단 데이터가 없습니다." if n == 0
+                   else "인구집단 데이터가 만료되었습니다. 다시 생성하세요.")
+        fig = go.Figure(layout=TWIN_LAYOUT)
+        fig.add_annotation(
+            text=message,
+            xref="paper", yref="paper",
+            x=0.5, y=0.5, showarrow=False,
+            font=dict(size=16, color=COLORS['text_muted'])
         )
+        return fig
     
-    # 더 많은 개인이 있을 경우 표시
-    if len(individuals) > display_limit:
-        icons.append(
-            html.Div(
-                f"+{len(individuals) - display_limit}",
-                style={
-                    'padding': '4px 10px',
-                    'fontSize': '12px',
-                    'color': COLORS['text_muted'],
-                    'fontWeight': '600'
-                }
-            )
+    return build_twin_figure(population_data['key'], n, bool(show_all))
+
+
+@lru_cache(maxsize=8)
+def build_twin_figure(pop_key: str, n: int, show_all: bool) -> go.Figure:
+    """디지털 트윈 figure 생성 (같은 인구집단·표시 모드면 캐시된 figure 재사용)
+
+    '전체 표시'를 껐다 켜거나 같은 Store 값으로 다시 호출될 때
+    표본 추출과 툴팁 문자열 생성을 반복하지 않습니다.
+    """
+    fig = go.Figure(layout=TWIN_LAYOUT)
+    
+    pop = get_population(pop_key)
+    codes = pop['metab'].astype(np.intp)
+    
+    if show_all or n <= TWIN_SAMPLE_LIMIT:
+        # 전체 표시: 인덱스 배열 대신 슬라이스로 복사 없는 view 사용
+        idx = np.arange(n)
+        sel = slice(None)
+    else:
+        # 표현형 비율을 유지하는 비례 층화 추출 (고정 시드로 화면이 흔들리지 않게)
+        # 할당량 ∝ 표현형 인원, 최대 잉여법으로 TWIN_SAMPLE_LIMIT를 정확히 채움
+        # (점 밀도 자체가 코호트의 표현형 분포를 보여주므로 동일 할당을 쓰지 않음)
+        rng = np.random.default_rng(0)
+        counts = np.bincount(codes, minlength=len(METABOLIZER_LABELS))
+        exact = counts * (TWIN_SAMPLE_LIMIT / n)
+        quota = np.floor(exact).astype(np.intp)
+        remainder = TWIN_SAMPLE_LIMIT - quota.sum()
+        quota[np.argsort(quota - exact, kind='stable')[:remainder]] += 1
+        idx = np.sort(np.concatenate([
+            rng.choice(np.flatnonzero(codes == c), quota[c], replace=False)
+            for c in range(len(METABOLIZER_LABELS))
+        ]))
+        sel = idx
+    
+    ncols = 40
+    pos = np.arange(idx.size)
+    x = pos % ncols
+    y = pos // ncols
+    
+    # 대사자 표현형 코드 (PM=0, IM=1, NM=2, UM=3) → 색상
+    metab = codes[sel]
+    colors = COLOR_LUT.take(metab)
+    
+    # 성별은 마커 모양으로 구분 (남: 원, 여: 다이아몬드)
+    symbols = np.where(pop['gender'][sel] == 1, 'circle', 'diamond')
+    
+    # 툴팁 문자열은 필드별 문자열 배열을 한 번에 이어 붙여 생성 (개인별 f-string 반복 제거)
+    def column(name):
+        return pop[name][sel]
+    
+    text = np.char.add(np.char.add('ID: ', np.char.mod('%d', column('id'))), '<br>나이: ')
+    text = np.char.add(np.char.add(text, np.char.mod('%d', column('age'))), '세<br>체중: ')
+    text = np.char.add(np.char.add(text, np.char.mod('%.1f', column('weight'))), 'kg<br>민족: ')
+    text = np.char.add(np.char.add(text, ETHNICITY_LABELS[column('eth')]), '<br>표현형: ')
+    text = np.char.add(text, METABOLIZER_LABEL_LUT.take(metab))
+    
+    fig.add_trace(go.Scattergl(
+        x=x, y=y,
+        mode='markers',
+        marker=dict(color=colors, symbol=symbols, size=12 if idx.size <= TWIN_SAMPLE_LIMIT else 8,
+                    line=dict(width=0)),
+        text=text.tolist(),
+        customdata=idx,
+        hoverinfo='text'
+    ))
+    
+    if idx.size < n:
+        fig.add_annotation(
+            text=f"{n}명 중 {idx.size}명 표본 표시 (표현형 비율 유지)",
+            xref="paper", yref="paper",
+            x=1.0, y=0.0, xanchor='right', yanchor='top', showarrow=False,
+            font=dict(size=11, color=COLORS['text_muted'])
         )
+        fig.update_layout(margin=dict(l=10, r=10, t=10, b=25))
     
-    return icons
+    return fig
+
+
+@callback(
+    Output('selected-individual-info', 'children'),
+    Input('digital-twin-graph', 'clickData'),
+    State('population-individuals', 'data'),
+    prevent_initial_call=True
+)
+def show_selected_individual(click_data, population_data):
+    """디지털 트윈에서 클릭한 개인의 상세 정보 표시"""
+    if not click_data or population_data is None:
+        return None
+    
+    pop = get_population(population_data['key'])
+    if pop is None:
+        return None
+    
+    i = click_data['points'][0]['customdata']
+    
+    return html.Div([
+        dbc.Badge(f"ID {pop['id'][i]}", color='primary', className='me-1'),
+        dbc.Badge(f"{pop['age'][i]}세 / {'남' if pop['gender'][i] == 1 else '여'}", color='info', className='me-1'),
+        dbc.Badge(f"{pop['weight'][i]:.1f}kg · BMI {pop['bmi'][i]:.1f}", color='info', className='me-1'),
+        dbc.Badge(ETHNICITY_ORDER[pop['eth'][i]].value, color='secondary', className='me-1'),
+        dbc.Badge(f"{METABOLIZER_LABELS[pop['metab'][i]]} (AS {pop['activity_score'][i]:.2f})",
+                  color='dark', className='me-1'),
+        html.Small(f" CYP2C19 {pop['cyp2c19'][i]} · CYP3A4 {pop['cyp3a4'][i]}", className='text-muted')
+    ])
 
 
 # ============================================================================
@@ -0,0 +1,41 @@
+/*
+ * PK 곡선 / 안전 마진 clientside 콜백
+ *
+ * 서버(update_result_views)는 새 시뮬레이션 결과가 들어올 때만 figure를 만들고,
+ * 이미 브라우저에 있는 figure를 눈에 보이게만 바꾸는 조작은 여기서 처리합니다.
+ *  - toggleIndividuals: 개인별 곡선 trace(data[0])의 visible 토글
+ *  - moveThreshold: 히스토그램 임계값 선(shapes[0])과 주석(annotations[0]) 이동
+ *
+ * Dash가 변경을 감지하도록 figure/data/layout은 얕은 복사본을 새로 만들어 반환합니다.
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    pk: {
+        toggleIndividuals: function (show, figure) {
+            if (!figure || !figure.data || !figure.data.length) {
+                return window.dash_clientside.no_update;
+            }
+            var data = figure.data.slice();
+            data[0] = Object.assign({}, data[0], {visible: !!show});
+            return Object.assign({}, figure, {data: data});
+        },
+
+        moveThreshold: function (threshold, figure) {
+            var layout = figure && figure.layout;
+            if (threshold === null || threshold === undefined ||
+                    !layout || !layout.shapes || !layout.shapes.length) {
+                return window.dash_clientside.no_update;
+            }
+            var shapes = layout.shapes.slice();
+            shapes[0] = Object.assign({}, shapes[0], {x0: threshold, x1: threshold});
+
+            var annotations = (layout.annotations || []).slice();
+            if (annotations.length) {
+                annotations[0] = Object.assign({}, annotations[0], {x: threshold});
+            }
+
+            return Object.assign({}, figure, {
+                layout: Object.assign({}, layout, {shapes: shapes, annotations: annotations})
+            });
+        }
+    }
+});
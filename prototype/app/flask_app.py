@@ -10,7 +10,13 @@ HTML/CSS 파일을 직접 수정할 수 있는 Flask 기반 웹앱
 - models/ : 모델링 코드 (engine.py, pbpk_model.py)
 """
 
+import json
+import os
 import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from pathlib import Path
 
 # 상위 폴더를 경로에 추가 (models 패키지 import 위해)
@@ -18,24 +24,101 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from flask import Flask, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+
+# orjson은 선택 의존성: 설치되어 있으면 API 응답 직렬화에 사용
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # models 패키지에서 import
 from models import (
-    PopulationGenerator, Ethnicity,
+    PopulationGenerator, Ethnicity, ETHNICITY_ORDER,
     DrugParameters, SimulationConfig, PhysiologicalParameters,
-    run_population_simulation
+    run_population_simulation, PHYS_FIELDS
 )
 
 
-def fetch_pubchem_data(drug_name: str) -> dict:
+# ============================================================================
+# PubChem 조회 캐시
+# ============================================================================
+
+PUBCHEM_CACHE_SIZE = 512
+PUBCHEM_CACHE_TTL = 86400   # 초 (하루)
+PUBCHEM_CACHE_FILE = ROOT_DIR / '.pubchem_cache.json'
+
+_pubchem_cache = OrderedDict()   # 정규화된 약물명 -> (저장 시각(epoch), 결과 dict)
+_pubchem_cache_lock = threading.Lock()
+# 디스크 저장은 조회 잠금과 분리 (느린 쓰기가 동시 조회를 막지 않도록)
+_pubchem_save_lock = threading.Lock()
+_pubchem_cache_version = 0       # 캐시 변경 횟수 (_pubchem_cache_lock 아래에서 증가)
+_pubchem_saved_version = 0       # 마지막으로 디스크에 쓴 버전 (_pubchem_save_lock 아래에서 갱신)
+
+
+def _load_pubchem_cache():
+    """디스크에 저장된 PubChem 캐시 불러오기 (서버를 재시작해도 조회 결과 유지)"""
+    try:
+        entries = json.loads(PUBCHEM_CACHE_FILE.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return
+    
+    # 캐시는 선택 사항이므로 형식이 맞지 않는 파일은 통째로 버리고 빈 캐시로 시작
+    # (기대 형식: {약물명: [저장 시각(epoch), 결과 dict]})
+    def valid(key, entry):
+        return (
+            isinstance(key, str)
+            and isinstance(entry, list) and len(entry) == 2
+            and isinstance(entry[0], (int, float)) and not isinstance(entry[0], bool)
+            and isinstance(entry[1], dict)
+        )
+    
+    if not isinstance(entries, dict) or not all(valid(k, v) for k, v in entries.items()):
+        print(f"[PubChem cache] 형식이 올바르지 않아 무시합니다: {PUBCHEM_CACHE_FILE}")
+        return
+    
+    now = time.time()
+    for key, (stored_at, data) in entries.items():
+        if now - stored_at < PUBCHEM_CACHE_TTL:
+            _pubchem_cache[key] = (stored_at, data)
+
+
+def _save_pubchem_cache(snapshot: dict, version: int):
+    """PubChem 캐시 스냅샷을 디스크에 저장 (임시 파일에 쓴 뒤 교체하여 파일이 깨지지 않게 함)
+
+    _pubchem_cache_lock 밖에서 호출합니다. 더 최신 스냅샷이 이미 저장되었으면 건너뜁니다.
+    """
+    global _pubchem_saved_version
+    
+    tmp_path = PUBCHEM_CACHE_FILE.with_suffix('.tmp')
+    with _pubchem_save_lock:
+        if version <= _pubchem_saved_version:
+            return
+        try:
+            tmp_path.write_text(json.dumps(snapshot, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_path, PUBCHEM_CACHE_FILE)
+            _pubchem_saved_version = version
+        except OSError as e:
+            print(f"[PubChem cache] 저장 실패: {e}")
+
+
+_load_pubchem_cache()
+
+# 조회마다 새 TCP/TLS 연결을 맺지 않도록 keep-alive 연결 풀을 가진 세션 재사용
+_pubchem_session = requests.Session()
+_pubchem_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
+def _query_pubchem(drug_name: str) -> dict:
     """PubChem API에서 약물 정보 가져오기"""
     try:
         base_url = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
         props_url = f"{base_url}/compound/name/{drug_name}/property/MolecularWeight,XLogP,IUPACName/JSON"
         
-        response = requests.get(props_url, timeout=10)
+        response = _pubchem_session.get(props_url, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
@@ -55,7 +138,106 @@ def fetch_pubchem_data(drug_name: str) -> dict:
         return {'found': False, 'name': drug_name, 'error': str(e)}
 
 
+def fetch_pubchem_data(drug_name: str) -> dict:
+    """PubChem 약물 정보 조회 (공백 제거 + 소문자 약물명 기준 TTL 캐시)
+
+    찾은 결과만 캐시하므로 네트워크 오류나 미등록 약물은 다음 요청에서 다시 조회합니다.
+    """
+    global _pubchem_cache_version
+    
+    key = drug_name.strip().lower()
+    now = time.time()
+    
+    with _pubchem_cache_lock:
+        entry = _pubchem_cache.get(key)
+        if entry is not None and now - entry[0] < PUBCHEM_CACHE_TTL:
+            _pubchem_cache.move_to_end(key)
+            app.logger.debug("PubChem cache hit: %s", key)
+            return {**entry[1], 'name': drug_name}
+    
+    app.logger.debug("PubChem cache miss: %s", key)
+    data = _query_pubchem(key)
+    
+    if data['found']:
+        # 잠금 안에서는 스냅샷만 뜨고, 파일 쓰기는 잠금 밖에서
+        with _pubchem_cache_lock:
+            _pubchem_cache[key] = (now, data)
+            _pubchem_cache.move_to_end(key)
+            while len(_pubchem_cache) > PUBCHEM_CACHE_SIZE:
+                _pubchem_cache.popitem(last=False)
+            _pubchem_cache_version += 1
+            snapshot, version = dict(_pubchem_cache), _pubchem_cache_version
+        _save_pubchem_cache(snapshot, version)
+    
+    return {**data, 'name': drug_name}
+
+
+def to_wire_list(values: np.ndarray, decimals: int = 3):
+    """시뮬레이션 배열 → JSON 직렬화용 값 (소수점 decimals자리로 반올림)
+
+    농도(ng/mL)는 소수점 3자리면 충분하므로 float64 전체 자릿수
+    (예: 123.45678901234567)를 보내지 않아 응답 JSON 길이가 절반 이하로 줄어듭니다.
+    float32로 바꾼 뒤 리스트로 만들면 오히려 0.4000000059604645처럼
+    자릿수가 늘어나므로 float64 상태에서 반올림합니다.
+    orjson이 있으면 Python 리스트를 거치지 않고 배열을 그대로 반환합니다.
+    """
+    rounded = np.round(np.asarray(values, dtype=np.float64), decimals)
+    return rounded if orjson is not None else rounded.tolist()
+
+
+# generate_arrays()의 정수 코드 → 표시 문자열 (코드로 인덱싱하는 LUT)
+METABOLIZER_LABELS = np.array(['PM', 'IM', 'NM', 'UM'])   # METABOLIZER_ORDER 순
+ETHNICITY_LABELS = np.array([eth.value for eth in ETHNICITY_ORDER])
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson 기반 Flask JSON provider (NumPy 배열을 리스트 변환 없이 직렬화)"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+
+# ============================================================================
+# 인구집단 서버 캐시
+# ============================================================================
+
+# 생성된 인구집단의 생리학적 파라미터 행렬을 서버에 보관하고 클라이언트에는 ID만 전달
+# (시뮬레이션 요청마다 개인별 JSON을 다시 업로드/파싱하지 않도록)
+POPULATION_CACHE_SIZE = 16
+
+_population_cache = OrderedDict()   # population_id -> PHYS_DTYPE 구조화 배열 (또는 (N, 7) 행렬)
+_population_cache_lock = threading.Lock()
+
+
+def cache_population(phys: np.ndarray) -> str:
+    """생리학적 파라미터 배열을 캐시에 저장하고 population_id 반환"""
+    population_id = str(uuid.uuid4())
+    with _population_cache_lock:
+        _population_cache[population_id] = phys
+        while len(_population_cache) > POPULATION_CACHE_SIZE:
+            _population_cache.popitem(last=False)
+    return population_id
+
+
+def get_cached_population(population_id):
+    """population_id로 캐시된 배열 반환 (없거나 밀려났으면 None)"""
+    with _population_cache_lock:
+        phys = _population_cache.get(population_id)
+        if phys is not None:
+            _population_cache.move_to_end(population_id)
+        return phys
 
 
 # ============================================================================
@@ -78,15 +260,11 @@ def api_generate_population():
     try:
         data = request.json
         
-        # 민족 비율 정규화
-        total_eth = data['eth_asian'] + data['eth_european'] + data['eth_african']
-        if total_eth == 0:
-            total_eth = 100
-        
+        # 민족 비율(%)은 PopulationGenerator가 정규화 (모두 0이면 균등 배분)
         ethnicity_dist = {
-            Ethnicity.EAST_ASIAN: data['eth_asian'] / total_eth,
-            Ethnicity.EUROPEAN: data['eth_european'] / total_eth,
-            Ethnicity.AFRICAN: data['eth_african'] / total_eth
+            Ethnicity.EAST_ASIAN: data['eth_asian'],
+            Ethnicity.EUROPEAN: data['eth_european'],
+            Ethnicity.AFRICAN: data['eth_african']
         }
         
         # 인구집단 생성
@@ -101,44 +279,54 @@ def api_generate_population():
             random_seed=None  # 매번 새로운 인구집단
         )
         
-        population = generator.generate()
-        pop_summary = generator.get_population_summary(population)
+        population = generator.generate_arrays()
+        pop_summary = generator.get_array_summary(population)
         
         # 개인별 데이터 (프론트엔드용)
-        individuals = []
-        metabolizer_map = {
-            'Poor Metabolizer (PM)': 'PM',
-            'Intermediate Metabolizer (IM)': 'IM',
-            'Normal Metabolizer (NM)': 'NM',
-            'Ultra-rapid Metabolizer (UM)': 'UM'
-        }
+        # 필드별 배열을 한 번에 반올림/문자열화한 뒤 행 단위로 묶음
+        phys = population['phys']
+        # (float32 저장값이 JSON에 긴 소수로 나가지 않도록 유효 자릿수만 남김)
+        phys_rows = zip(*(
+            np.round(phys[name].astype(np.float64), 4).tolist() for name in PHYS_FIELDS
+        ))
+        
+        individuals = [
+            {
+                'id': subject_id,
+                'age': age,
+                'gender': gender,
+                'weight': weight,
+                'height': height,
+                'bmi': bmi,
+                'ethnicity': ethnicity,
+                'metabolizer': metabolizer,
+                'activity_score': activity_score,
+                'cyp2c19': cyp2c19,
+                'cyp3a4': cyp3a4,
+                'phys_params': dict(zip(PHYS_FIELDS, phys_values))
+            }
+            for (subject_id, age, gender, weight, height, bmi, ethnicity, metabolizer,
+                 activity_score, cyp2c19, cyp3a4, phys_values) in zip(
+                population['subject_id'].tolist(),
+                population['age'].tolist(),
+                population['gender'].tolist(),
+                np.round(population['weight'], 1).tolist(),
+                np.round(population['height'].astype(np.float64), 1).tolist(),
+                np.round(population['bmi'].astype(np.float64), 1).tolist(),
+                ETHNICITY_LABELS.take(population['ethnicity']).tolist(),
+                METABOLIZER_LABELS.take(population['metabolizer']).tolist(),
+                np.round(population['combined_activity_score'], 2).tolist(),
+                population['cyp2c19_diplotype'].tolist(),
+                population['cyp3a4_diplotype'].tolist(),
+                phys_rows
+            )
+        ]
         
-        for ind in population:
-            individuals.append({
-                'id': ind.subject_id,
-                'age': ind.age,
-                'gender': ind.gender,
-                'weight': round(ind.weight, 1),
-                'height': round(ind.height, 1),
-                'bmi': round(ind.bmi, 1),
-                'ethnicity': ind.ethnicity.value,
-                'metabolizer': metabolizer_map.get(ind.metabolizer_status.value, 'NM'),
-                'activity_score': round(ind.combined_activity_score, 2),
-                'cyp2c19': '/'.join(ind.cyp2c19_genotype),
-                'cyp3a4': '/'.join(ind.cyp3a4_genotype),
-                'phys_params': {
-                    'body_weight': ind.phys_params.body_weight,
-                    'v_plasma': ind.phys_params.v_plasma,
-                    'v_liver': ind.phys_params.v_liver,
-                    'q_liver': ind.phys_params.q_liver,
-                    'cl_int': ind.phys_params.cl_int,
-                    'cl_renal': ind.phys_params.cl_renal,
-                    'activity_score': ind.phys_params.activity_score
-                }
-            })
+        population_id = cache_population(phys)
         
         return jsonify({
             'success': True,
+            'population_id': population_id,
             'individuals': individuals,
             'summary': pop_summary
         })
@@ -171,32 +359,35 @@ def api_run_simulation():
             n_points=241
         )
         
-        # 인구집단 생리학적 파라미터 복원
-        population_phys = []
-        for ind in data['population']:
-            phys = ind.get('phys_params', {})
-            population_phys.append(PhysiologicalParameters(
-                body_weight=phys.get('body_weight', 70),
-                v_plasma=phys.get('v_plasma', 3.0),
-                v_liver=phys.get('v_liver', 1.5),
-                q_liver=phys.get('q_liver', 90),
-                cl_int=phys.get('cl_int', 10),
-                cl_renal=phys.get('cl_renal', 0),
-                activity_score=phys.get('activity_score', 1.0)
-            ))
+        # 인구집단 생리학적 파라미터: 서버 캐시(population_id) 우선,
+        # 없으면 요청에 포함된 개인별 데이터로 (N, 7) 행렬을 바로 구성
+        population_phys = get_cached_population(data.get('population_id'))
+        if population_phys is None:
+            if 'population' not in data:
+                return jsonify({
+                    'success': False,
+                    'error': '인구집단 데이터가 만료되었습니다',
+                    'error_code': 'population_expired'
+                }), 404
+            defaults = PhysiologicalParameters()
+            population_phys = np.array([
+                [ind.get('phys_params', {}).get(name, getattr(defaults, name)) for name in PHYS_FIELDS]
+                for ind in data['population']
+            ], dtype=np.float64).reshape(-1, len(PHYS_FIELDS))
         
         # 시뮬레이션 실행
-        results = run_population_simulation(drug_params, population_phys, sim_config)
+        # 요청 핸들러(멀티스레드 서버)에서는 프로세스 풀 없이 순차 일괄 풀이
+        results = run_population_simulation(drug_params, population_phys, sim_config, n_workers=1)
         
         return jsonify({
             'success': True,
-            'time': results['time'].tolist(),
-            'mean_concentration': results['mean_concentration'].tolist(),
-            'ci_lower': results['ci_lower'].tolist(),
-            'ci_upper': results['ci_upper'].tolist(),
-            'individual_curves': results['individual_curves'][:50].tolist(),
-            'cmax_distribution': results['cmax_distribution'].tolist(),
-            'auc_distribution': results['auc_distribution'].tolist()
+            'time': to_wire_list(results['time']),
+            'mean_concentration': to_wire_list(results['mean_concentration']),
+            'ci_lower': to_wire_list(results['ci_lower']),
+            'ci_upper': to_wire_list(results['ci_upper']),
+            'individual_curves': to_wire_list(results['individual_curves'][:50]),
+            'cmax_distribution': to_wire_list(results['cmax_distribution']),
+            'auc_distribution': to_wire_list(results['auc_distribution'])
         })
         
     except Exception as e:
@@ -212,17 +212,19 @@ async function runSimulation() {
         k_a: parseFloat(document.getElementById('k-a').value),
         dose: parseFloat(document.getElementById('dose').value),
         bioavail: parseFloat(document.getElementById('bioavail').value),
-        population: populationData.individuals
+        // 인구집단은 서버에 보관되어 있으므로 ID만 전송
+        population_id: populationData.population_id
     };
 
     try {
-        const response = await fetch('/api/run-simulation', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(params)
-        });
+        let response = await postSimulation(params);
+        let data = await response.json();
 
-        const data = await response.json();
+        // 서버 캐시에서 밀려난 경우에만 개인별 데이터를 함께 보내 재시도
+        if (data.error_code === 'population_expired') {
+            response = await postSimulation({ ...params, population: populationData.individuals });
+            data = await response.json();
+        }
 
         if (data.success) {
             simulationData = data;
@@ -245,6 +247,14 @@ async function runSimulation() {
     }
 }
 
+function postSimulation(params) {
+    return fetch('/api/run-simulation', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(params)
+    });
+}
+
 // ============================================
 // PK 곡선 렌더링
 // ============================================
@@ -253,26 +263,43 @@ function renderPKCurves(data) {
 
     const traces = [];
 
-    // 개별 곡선 (일부만)
+    // 개별 곡선 (일부만) - null 구분자로 이어 붙여 하나의 WebGL trace로 그림
     if (data.individual_curves) {
-        for (let i = 0; i < Math.min(30, data.individual_curves.length); i++) {
-            traces.push({
-                x: data.time,
-                y: data.individual_curves[i],
-                mode: 'lines',
-                opacity: 0.3,
-                line: { color: '#BDBDBD', width: 1 },
-                showlegend: false,
-                hoverinfo: 'skip'
-            });
+        const curves = data.individual_curves.slice(0, 30);
+        const xs = [];
+        const ys = [];
+        for (const curve of curves) {
+            xs.push(...data.time, null);
+            ys.push(...curve, null);
         }
+        traces.push({
+            type: 'scattergl',
+            x: xs,
+            y: ys,
+            mode: 'lines',
+            opacity: 0.3,
+            line: { color: '#BDBDBD', width: 1 },
+            showlegend: false,
+            hoverinfo: 'skip'
+        });
     }
 
-    // 90% CI
+    // 90% CI (하한선 → 상한선 'tonexty' 채우기)
+    traces.push({
+        type: 'scattergl',
+        x: data.time,
+        y: data.ci_lower,
+        mode: 'lines',
+        line: { color: 'transparent' },
+        showlegend: false,
+        hoverinfo: 'skip'
+    });
     traces.push({
-        x: data.time.concat([...data.time].reverse()),
-        y: data.ci_upper.concat([...data.ci_lower].reverse()),
-        fill: 'toself',
+        type: 'scattergl',
+        x: data.time,
+        y: data.ci_upper,
+        mode: 'lines',
+        fill: 'tonexty',
         fillcolor: 'rgba(30, 58, 95, 0.2)',
         line: { color: 'transparent' },
         showlegend: true,
@@ -281,6 +308,7 @@ function renderPKCurves(data) {
 
     // 평균 곡선
     traces.push({
+        type: 'scattergl',
         x: data.time,
         y: data.mean_concentration,
         mode: 'lines',
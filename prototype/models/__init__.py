@@ -1,6 +1,9 @@
 # models 폴더를 Python 패키지로 만들기
-from .engine import PopulationGenerator, Ethnicity, MetabolizerStatus, calculate_safety_margin
+from .engine import (
+    PopulationGenerator, Ethnicity, MetabolizerStatus, calculate_safety_margin,
+    ETHNICITY_ORDER, METABOLIZER_ORDER
+)
 from .pbpk_model import (
     PBPKModel, DrugParameters, PhysiologicalParameters,
-    SimulationConfig, run_population_simulation
+    SimulationConfig, run_population_simulation, PHYS_FIELDS, PHYS_DTYPE
 )
@@ -12,13 +12,15 @@ Features:
 
 import json
 import os
+from functools import lru_cache
+
 import numpy as np
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Iterator
 from enum import Enum
 from pathlib import Path
 
-from .pbpk_model import PhysiologicalParameters
+from .pbpk_model import PhysiologicalParameters, PHYS_FIELDS, PHYS_DTYPE
 
 
 # ============================================================================
@@ -30,8 +32,9 @@ def get_data_dir() -> Path:
     return Path(__file__).parent.parent / "data"
 
 
+@lru_cache(maxsize=1)
 def load_allele_frequencies() -> Dict:
-    """JSON 파일에서 대립유전자 빈도 데이터 로드
+    """JSON 파일에서 대립유전자 빈도 데이터 로드 (프로세스당 한 번만 파싱)
     
     Returns:
         민족별 CYP 효소 대립유전자 빈도 딕셔너리
@@ -50,8 +53,9 @@ def load_allele_frequencies() -> Dict:
     return data.get("allele_frequencies", {})
 
 
+@lru_cache(maxsize=1)
 def load_activity_scores() -> Dict:
-    """JSON 파일에서 Activity Score 데이터 로드
+    """JSON 파일에서 Activity Score 데이터 로드 (프로세스당 한 번만 파싱)
     
     Returns:
         CYP 효소별 대립유전자 Activity Score 딕셔너리
@@ -91,6 +95,14 @@ class MetabolizerStatus(Enum):
     ULTRA_RAPID = "Ultra-rapid Metabolizer (UM)"
 
 
+# generate_arrays()의 정수 코드 ↔ Enum 매핑 (코드 = 튜플 인덱스)
+ETHNICITY_ORDER = tuple(Ethnicity)
+METABOLIZER_ORDER = tuple(MetabolizerStatus)   # PM, IM, NM, UM 순
+
+# 대사자 표현형 경계 Activity Score (각 구간 상한 포함: PM ≤ 0.25 < IM ≤ 1.0 < NM ≤ 2.0 < UM)
+METABOLIZER_AS_BOUNDS = np.array([0.25, 1.0, 2.0])
+
+
 # Load data from JSON files at module import
 # This allows the data to be cached and reused
 try:
@@ -141,6 +153,31 @@ def get_activity_score(gene: str, allele: str) -> float:
     return _ACTIVITY_SCORE_DATA[gene].get(allele, 1.0)
 
 
+@lru_cache(maxsize=None)
+def get_allele_arrays(
+    ethnicity: Ethnicity, gene: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """민족/유전자별 대립유전자 이름·빈도·Activity Score 배열 (최초 호출 시 한 번만 생성)
+    
+    유전자형 샘플링 때마다 dict를 순회해 리스트를 만들지 않도록
+    get_allele_frequencies / get_activity_score 결과를 NumPy 배열로 캐싱합니다.
+    대립유전자는 이름순으로 정렬해 두므로, 샘플링한 인덱스를 정수 정렬하면
+    유전자형도 이름순(*1/*2)이 됩니다.
+    
+    Returns:
+        (대립유전자 이름, 빈도, Activity Score) 배열 튜플 (읽기 전용)
+    """
+    allele_freqs = get_allele_frequencies(ethnicity, gene)
+    alleles = np.array(sorted(allele_freqs))
+    probs = np.array([allele_freqs[a] for a in alleles], dtype=np.float64)
+    probs /= probs.sum()   # JSON 빈도의 반올림 오차로 합이 1에서 벗어나도 rng.choice가 실패하지 않도록
+    scores = np.array([get_activity_score(gene, a) for a in alleles], dtype=np.float64)
+    
+    for arr in (alleles, probs, scores):
+        arr.flags.writeable = False
+    return alleles, probs, scores
+
+
 @dataclass
 class IndividualCharacteristics:
     """개인 특성 데이터 클래스"""
@@ -186,6 +223,7 @@ class PopulationGenerator:
         Args:
             n_subjects: 생성할 개인 수
             ethnicity_distribution: 민족별 비율 (예: {EAST_ASIAN: 0.5, EUROPEAN: 0.3, AFRICAN: 0.2})
+                합이 1이 아니어도 되며(예: 퍼센트), 모두 0이면 주어진 민족에 균등 배분
             age_range: 나이 범위 (min, max)
             gender_ratio: 남성 비율 (0-1)
             weight_mean: 평균 체중 (kg)
@@ -201,16 +239,24 @@ class PopulationGenerator:
         self.base_cl_int = base_cl_int
         
         if ethnicity_distribution is None:
-            self.ethnicity_distribution = {
+            ethnicity_distribution = {
                 Ethnicity.EAST_ASIAN: 0.34,
                 Ethnicity.EUROPEAN: 0.33,
                 Ethnicity.AFRICAN: 0.33
             }
-        else:
-            self.ethnicity_distribution = ethnicity_distribution
         
-        if random_seed is not None:
-            np.random.seed(random_seed)
+        # 비율 정규화 후 ETHNICITY_ORDER 순서의 확률 배열로 한 번만 변환
+        weights = np.array(list(ethnicity_distribution.values()), dtype=np.float64)
+        total = weights.sum()
+        weights = weights / total if total > 0 else np.full(weights.size, 1 / weights.size)
+        
+        self.ethnicity_distribution = dict(zip(ethnicity_distribution, weights.tolist()))
+        self.ethnicity_probs = np.zeros(len(ETHNICITY_ORDER))
+        self.ethnicity_probs[[ETHNICITY_ORDER.index(e) for e in ethnicity_distribution]] = weights
+        
+        # 전역 np.random 상태 대신 인스턴스 전용 Generator(PCG64) 사용
+        # (다른 모듈/생성기의 난수 소비에 영향을 주거나 받지 않음)
+        self.rng = np.random.default_rng(random_seed)
     
     def generate(self) -> List[IndividualCharacteristics]:
         """가상 인구집단 생성
@@ -218,38 +264,31 @@ class PopulationGenerator:
         Returns:
             IndividualCharacteristics 객체 리스트
         """
-        population = []
+        return list(self.iter_individuals(self.generate_arrays()))
+    
+    @staticmethod
+    def iter_individuals(arrays: Dict) -> Iterator[IndividualCharacteristics]:
+        """generate_arrays() 결과(SoA)를 개인별 IndividualCharacteristics로 순회
         
-        for i in range(self.n_subjects):
-            # 1. 기본 인구통계학적 특성
-            ethnicity = self._sample_ethnicity()
-            gender = 'M' if np.random.random() < self.gender_ratio else 'F'
-            age = np.random.randint(self.age_range[0], self.age_range[1] + 1)
-            
-            # 2. 신체 계측 (성별 고려)
-            weight, height, bmi = self._sample_anthropometrics(gender, age)
-            
-            # 3. 유전자형 할당
-            cyp2c19_genotype = self._sample_genotype('CYP2C19', ethnicity)
-            cyp3a4_genotype = self._sample_genotype('CYP3A4', ethnicity)
-            
-            # 4. Activity Score 계산
-            cyp2c19_as = self._calculate_activity_score('CYP2C19', cyp2c19_genotype)
-            cyp3a4_as = self._calculate_activity_score('CYP3A4', cyp3a4_genotype)
-            
-            # 5. 종합 Activity Score (CYP2C19과 CYP3A4의 기하평균)
-            combined_as = np.sqrt(cyp2c19_as * cyp3a4_as)
-            
-            # 6. 대사자 표현형 분류
-            metabolizer_status = self._classify_metabolizer(combined_as)
-            
-            # 7. 생리학적 파라미터 생성
-            phys_params = self._generate_physiological_params(
-                weight, age, gender, combined_as
-            )
-            
-            individual = IndividualCharacteristics(
-                subject_id=i + 1,
+        계산은 배열 그대로 하고, 개인 단위 객체가 필요한 경계(출력/직렬화)에서만 사용합니다.
+        """
+        # 열마다 tolist()로 한 번에 Python 값으로 바꾼 뒤 행 단위로 묶음
+        # (개인 × 필드마다 NumPy 스칼라를 인덱싱/변환하지 않도록)
+        columns = {
+            name: arrays[name].tolist()
+            for name in ('subject_id', 'age', 'gender', 'weight', 'height', 'bmi',
+                         'cyp2c19_activity_score', 'cyp3a4_activity_score',
+                         'combined_activity_score')
+        }
+        ethnicities = [ETHNICITY_ORDER[code] for code in arrays['ethnicity'].tolist()]
+        statuses = [METABOLIZER_ORDER[code] for code in arrays['metabolizer'].tolist()]
+        cyp2c19 = list(map(tuple, arrays['cyp2c19_genotype'].tolist()))
+        cyp3a4 = list(map(tuple, arrays['cyp3a4_genotype'].tolist()))
+        phys_rows = zip(*(arrays['phys'][name].tolist() for name in PHYS_FIELDS))
+        
+        return (
+            IndividualCharacteristics(
+                subject_id=subject_id,
                 age=age,
                 gender=gender,
                 ethnicity=ethnicity,
@@ -261,105 +300,196 @@ class PopulationGenerator:
                 cyp2c19_activity_score=cyp2c19_as,
                 cyp3a4_activity_score=cyp3a4_as,
                 combined_activity_score=combined_as,
-                metabolizer_status=metabolizer_status,
-                phys_params=phys_params
+                metabolizer_status=status,
+                phys_params=PhysiologicalParameters(**dict(zip(PHYS_FIELDS, phys_values)))
             )
-            
-            population.append(individual)
+            for (subject_id, age, gender, ethnicity, weight, height, bmi,
+                 cyp2c19_genotype, cyp3a4_genotype, cyp2c19_as, cyp3a4_as, combined_as,
+                 status, phys_values) in zip(
+                columns['subject_id'], columns['age'], columns['gender'], ethnicities,
+                columns['weight'], columns['height'], columns['bmi'],
+                cyp2c19, cyp3a4,
+                columns['cyp2c19_activity_score'], columns['cyp3a4_activity_score'],
+                columns['combined_activity_score'],
+                statuses, phys_rows
+            )
+        )
+    
+    def generate_arrays(self) -> Dict:
+        """가상 인구집단을 필드별 병렬 NumPy 배열(SoA)로 생성
+        
+        개인별 객체를 만들지 않으므로 대규모 인구집단을 그대로
+        run_population_simulation / 시각화 코드에 넘길 수 있습니다.
+        
+        Returns:
+            Dictionary of (N,) arrays:
+                - subject_id, age, gender ('M'/'F'), weight, height, bmi
+                - ethnicity: ETHNICITY_ORDER 인덱스 코드
+                - cyp2c19_genotype, cyp3a4_genotype: (N, 2) 대립유전자 배열
+                - cyp2c19_diplotype, cyp3a4_diplotype: '*1/*2' 형식 문자열 배열
+                - cyp2c19_activity_score, cyp3a4_activity_score, combined_activity_score
+                - metabolizer: METABOLIZER_ORDER 인덱스 코드
+                - phys: 생리학적 파라미터 (N,) 구조화 배열 (dtype=PHYS_DTYPE, phys['cl_int'] 등)
+        """
+        n = self.n_subjects
+        
+        # 1. 기본 인구통계학적 특성
+        ethnicity = self._sample_ethnicities(n)
+        gender = np.where(self.rng.random(n) < self.gender_ratio, 'M', 'F')
+        age = self.rng.integers(self.age_range[0], self.age_range[1] + 1, size=n).astype(np.int16)
         
-        return population
+        # 2. 신체 계측 (성별 고려)
+        weight, height, bmi = self._sample_anthropometrics(gender == 'M', age)
+        
+        # 3~4. 유전자형 할당 + Activity Score (민족별로 묶어 한 번에 샘플링)
+        groups = self._group_by_ethnicity(ethnicity)
+        cyp2c19_genotype, cyp2c19_as = self._sample_genotypes('CYP2C19', groups, n)
+        cyp3a4_genotype, cyp3a4_as = self._sample_genotypes('CYP3A4', groups, n)
+        
+        # 5. 종합 Activity Score (CYP2C19과 CYP3A4의 기하평균)
+        combined_as = np.sqrt(cyp2c19_as * cyp3a4_as)
+        
+        # 6. 대사자 표현형 분류
+        metabolizer = self._classify_metabolizers(combined_as)
+        
+        # 7. 생리학적 파라미터 생성
+        phys = self._generate_physiological_params(weight, age, combined_as)
+        
+        return {
+            'subject_id': np.arange(1, n + 1, dtype=np.int32),
+            'age': age,
+            'gender': gender,
+            'ethnicity': ethnicity.astype(np.int8),
+            'weight': weight,
+            'height': height.astype(np.float32),
+            'bmi': bmi.astype(np.float32),
+            'cyp2c19_genotype': cyp2c19_genotype,
+            'cyp3a4_genotype': cyp3a4_genotype,
+            'cyp2c19_diplotype': self._format_diplotypes(cyp2c19_genotype),
+            'cyp3a4_diplotype': self._format_diplotypes(cyp3a4_genotype),
+            'cyp2c19_activity_score': cyp2c19_as,
+            'cyp3a4_activity_score': cyp3a4_as,
+            'combined_activity_score': combined_as,
+            'metabolizer': metabolizer,
+            'phys': phys,
+        }
     
-    def _sample_ethnicity(self) -> Ethnicity:
-        """민족 샘플링"""
-        ethnicities = list(self.ethnicity_distribution.keys())
-        probs = [self.ethnicity_distribution[e] for e in ethnicities]
-        return np.random.choice(ethnicities, p=probs)
+    def _sample_ethnicities(self, n: int) -> np.ndarray:
+        """민족 샘플링 (ETHNICITY_ORDER 인덱스 코드, N명 한 번에)"""
+        return self.rng.choice(len(ETHNICITY_ORDER), size=n, p=self.ethnicity_probs)
     
     def _sample_anthropometrics(
-        self, gender: str, age: int
-    ) -> Tuple[float, float, float]:
+        self, is_male: np.ndarray, age: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """신체 계측치 샘플링
         
-        성별과 나이에 따른 체중, 키 분포를 고려합니다.
+        성별과 나이에 따른 체중, 키 분포를 고려합니다. (N명 한 번에)
+        중간 배열을 새로 만들지 않도록 out= / 제자리 연산으로 결과 배열에 바로 누적합니다.
         """
-        # 성별에 따른 체중 조정
-        if gender == 'M':
-            weight_adj = 1.1  # 남성은 평균 10% 더 무거움
-            height_mean = 175
-            height_sd = 7
-        else:
-            weight_adj = 0.9
-            height_mean = 162
-            height_sd = 6
-        
-        # 나이에 따른 체중 조정 (중년 이후 약간 증가)
-        age_factor = 1.0 + 0.005 * max(0, age - 40)
-        
-        weight = np.random.normal(
-            self.weight_mean * weight_adj * age_factor,
-            self.weight_sd
-        )
-        weight = max(40, min(weight, 150))  # 현실적인 범위로 제한
+        n = is_male.size
         
-        height = np.random.normal(height_mean, height_sd)
-        height = max(140, min(height, 200))
+        # 체중 평균 = 기준 평균 × 성별 조정(남성은 평균 10% 더 무거움) × 나이 조정(중년 이후 약간 증가)
+        weight_mean = np.where(is_male, self.weight_mean * 1.1, self.weight_mean * 0.9)
+        age_factor = np.subtract(age, 40, dtype=np.float64)
+        np.maximum(age_factor, 0, out=age_factor)
+        age_factor *= 0.005
+        age_factor += 1.0
+        weight_mean *= age_factor
         
-        bmi = weight / (height / 100) ** 2
+        # 정규분포 = 평균 + 표준편차 × 표준정규 난수
+        weight = self.rng.standard_normal(n)
+        weight *= self.weight_sd
+        weight += weight_mean
+        np.clip(weight, 40, 150, out=weight)  # 현실적인 범위로 제한
+        
+        height = self.rng.standard_normal(n)
+        height *= np.where(is_male, 7.0, 6.0)
+        height += np.where(is_male, 175.0, 162.0)
+        np.clip(height, 140, 200, out=height)
+        
+        # BMI = 체중 / (키(m))²
+        bmi = np.divide(height, 100)
+        np.square(bmi, out=bmi)
+        np.divide(weight, bmi, out=bmi)
         
         return weight, height, bmi
     
-    def _sample_genotype(
-        self, gene: str, ethnicity: Ethnicity
-    ) -> Tuple[str, str]:
-        """Hardy-Weinberg 평형을 사용한 유전자형 샘플링
+    @staticmethod
+    def _group_by_ethnicity(eth_codes: np.ndarray) -> List[Tuple[Ethnicity, np.ndarray]]:
+        """민족별 개인 인덱스 그룹 (유전자마다 마스크를 다시 만들지 않도록 한 번만 계산)"""
+        order = np.argsort(eth_codes, kind='stable')
+        counts = np.bincount(eth_codes, minlength=len(ETHNICITY_ORDER))
+        return [
+            (ETHNICITY_ORDER[code], members)
+            for code, members in enumerate(np.split(order, np.cumsum(counts)[:-1]))
+            if members.size
+        ]
+    
+    def _sample_genotypes(
+        self, gene: str, groups: List[Tuple[Ethnicity, np.ndarray]], n: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Hardy-Weinberg 평형을 사용한 유전자형 일괄 샘플링
         
-        개별 대립유전자를 독립적으로 샘플링하여 유전자형을 생성합니다.
+        민족별로 해당 인원의 두 대립유전자를 한 번의 rng.choice로
+        독립 샘플링하고, 대립유전자 Activity Score의 합을 함께 계산합니다.
         JSON 파일에서 로드된 대립유전자 빈도를 사용합니다.
+        
+        Args:
+            gene: 유전자명 (예: 'CYP2C19')
+            groups: _group_by_ethnicity() 결과 [(민족, 개인 인덱스 배열), ...]
+            n: 전체 인원
+            
+        Returns:
+            ((N, 2) 유전자형 배열, (N,) Activity Score 배열)
         """
-        # JSON에서 로드된 데이터 사용
-        allele_freqs = get_allele_frequencies(ethnicity, gene)
-        alleles = list(allele_freqs.keys())
-        probs = [allele_freqs[a] for a in alleles]
+        allele_arrays = [(members, *get_allele_arrays(ethnicity, gene)) for ethnicity, members in groups]
+        
+        # 대립유전자 이름 폭은 고정하지 않고 실제 배열의 dtype을 따름 (긴 이름이 잘리지 않도록)
+        name_dtype = (
+            np.result_type(*(alleles for _, alleles, _, _ in allele_arrays))
+            if allele_arrays else np.dtype('<U1')
+        )
+        genotype = np.empty((n, 2), dtype=name_dtype)
+        activity_score = np.empty(n)
         
-        # 두 대립유전자 독립 샘플링 (Hardy-Weinberg)
-        allele1 = np.random.choice(alleles, p=probs)
-        allele2 = np.random.choice(alleles, p=probs)
+        for members, alleles, probs, scores in allele_arrays:
+            
+            # 두 대립유전자 독립 샘플링 (Hardy-Weinberg)
+            draws = self.rng.choice(alleles.size, size=(members.size, 2), p=probs)
+            
+            # 이름순 정렬하여 일관된 표현 (*1/*2 = *1/*2, not *2/*1)
+            # alleles가 이름순이므로 문자열 비교 없이 인덱스만 정렬
+            draws.sort(axis=1)
+            
+            genotype[members] = alleles[draws]
+            # 대립유전자별 Activity Score LUT에서 두 번 gather하여 합산
+            activity_score[members] = scores[draws[:, 0]] + scores[draws[:, 1]]
         
-        # 정렬하여 일관된 표현 (*1/*2 = *1/*2, not *2/*1)
-        return tuple(sorted([allele1, allele2]))
+        return genotype, activity_score
+    
+    @staticmethod
+    def _format_diplotypes(genotypes: np.ndarray) -> np.ndarray:
+        """(N, 2) 대립유전자 배열 → '*1/*2' 형식 문자열 (N,) 배열 (개인별 join 없이 한 번에)"""
+        return np.char.add(np.char.add(genotypes[:, 0], '/'), genotypes[:, 1])
     
-    def _calculate_activity_score(
-        self, gene: str, genotype: Tuple[str, str]
-    ) -> float:
-        """유전자형에서 Activity Score 계산
+    def _classify_metabolizers(self, activity_score: np.ndarray) -> np.ndarray:
+        """Activity Score 기반 대사자 표현형 분류 (METABOLIZER_ORDER 인덱스 코드)
         
-        JSON 파일에서 로드된 Activity Score 데이터를 사용합니다.
+        AS ≤ 0.25: PM / ≤ 1.0: IM / ≤ 2.0: NM / 그 외: UM
+        (경계값은 아래 구간에 포함되므로 side='left': 경계 개수만큼의 이진 탐색 한 번)
         """
-        score1 = get_activity_score(gene, genotype[0])
-        score2 = get_activity_score(gene, genotype[1])
-        return score1 + score2
-    
-    def _classify_metabolizer(self, activity_score: float) -> MetabolizerStatus:
-        """Activity Score 기반 대사자 표현형 분류"""
-        if activity_score <= 0.25:
-            return MetabolizerStatus.POOR
-        elif activity_score <= 1.0:
-            return MetabolizerStatus.INTERMEDIATE
-        elif activity_score <= 2.0:
-            return MetabolizerStatus.NORMAL
-        else:
-            return MetabolizerStatus.ULTRA_RAPID
+        return np.searchsorted(METABOLIZER_AS_BOUNDS, activity_score, side='left').astype(np.int8)
     
     def _generate_physiological_params(
-        self, weight: float, age: int, gender: str, activity_score: float
-    ) -> PhysiologicalParameters:
+        self, weight: np.ndarray, age: np.ndarray, activity_score: np.ndarray
+    ) -> np.ndarray:
         """생리학적 파라미터 생성
         
         체중과 나이에 따른 장기 용적, 혈류량을 스케일링합니다.
-        """
-        # 체중 기반 스케일링
-        weight_ratio = weight / 70.0
         
+        Returns:
+            (N,) 구조화 배열 (dtype=PHYS_DTYPE, 필드별 float32)
+        """
         # 혈장 용적 (약 4.7% of body weight)
         v_plasma = 0.047 * weight
         
@@ -368,70 +498,96 @@ class PopulationGenerator:
         
         # 간 혈류량 (표준: 90 L/h, 체중에 따라 스케일링)
         # 나이에 따른 감소 고려 (60세 이상 10% 감소)
-        age_factor = 1.0 - 0.1 * max(0, (age - 60) / 20)
-        q_liver = 90 * weight_ratio ** 0.75 * age_factor
+        # (중간 배열 없이 q_liver / age_factor 배열에 제자리 연산)
+        age_factor = np.subtract(age, 60, dtype=np.float64)
+        age_factor /= 20
+        np.maximum(age_factor, 0, out=age_factor)
+        age_factor *= -0.1
+        age_factor += 1.0
+        
+        q_liver = np.divide(weight, 70.0)    # 체중 기반 스케일링 (weight / 70)
+        q_liver **= 0.75
+        q_liver *= 90
+        q_liver *= age_factor
         
         # 내재적 청소율 (Activity Score로 조정)
         # 추가적인 개인 간 변이 (CV 30%)
-        individual_variability = np.random.lognormal(0, 0.3)
-        cl_int = self.base_cl_int * activity_score * individual_variability
-        
-        # 신장 청소율 (선택적, 기본 0)
-        cl_renal = 0.0
-        
-        return PhysiologicalParameters(
-            body_weight=weight,
-            v_plasma=v_plasma,
-            v_liver=v_liver,
-            q_liver=q_liver,
-            cl_int=cl_int,
-            cl_renal=cl_renal,
-            activity_score=activity_score
-        )
+        cl_int = self.rng.lognormal(0, 0.3, size=weight.size)
+        cl_int *= self.base_cl_int * activity_score
+        
+        # 계산은 float64로 하고, 저장만 필드별 float32 구조화 배열에
+        # 신장 청소율 (선택적, 기본 0)은 zeros로 할당된 그대로 둠
+        phys = np.zeros(weight.size, dtype=PHYS_DTYPE)
+        phys['body_weight'] = weight
+        phys['v_plasma'] = v_plasma
+        phys['v_liver'] = v_liver
+        phys['q_liver'] = q_liver
+        phys['cl_int'] = cl_int
+        phys['activity_score'] = activity_score
+        return phys
     
     def get_population_summary(
         self, population: List[IndividualCharacteristics]
     ) -> Dict:
-        """인구집단 요약 통계"""
+        """인구집단 요약 통계 (개인 객체 리스트를 코드 배열로 바꿔 get_array_summary로 계산)"""
+        n = len(population)
+        eth_codes = {eth: code for code, eth in enumerate(ETHNICITY_ORDER)}
+        met_codes = {status: code for code, status in enumerate(METABOLIZER_ORDER)}
+        
+        def column(values, dtype):
+            return np.fromiter(values, dtype=dtype, count=n)
+        
+        return self.get_array_summary({
+            'age': column((ind.age for ind in population), np.int16),
+            'gender': np.array([ind.gender for ind in population], dtype='<U1'),
+            'weight': column((ind.weight for ind in population), np.float64),
+            'ethnicity': column((eth_codes[ind.ethnicity] for ind in population), np.int8),
+            'metabolizer': column((met_codes[ind.metabolizer_status] for ind in population), np.int8),
+            'combined_activity_score': column(
+                (ind.combined_activity_score for ind in population), np.float64
+            ),
+        })
+    
+    def get_array_summary(self, arrays: Dict) -> Dict:
+        """인구집단 요약 통계 (generate_arrays() 결과 기준)"""
         
         # 기본 통계
-        weights = [ind.weight for ind in population]
-        ages = [ind.age for ind in population]
-        activity_scores = [ind.combined_activity_score for ind in population]
+        weights = arrays['weight']
+        ages = arrays['age']
+        activity_scores = arrays['combined_activity_score']
+        n_subjects = len(ages)
         
         # 성별 분포
-        n_male = sum(1 for ind in population if ind.gender == 'M')
-        n_female = len(population) - n_male
+        n_male = int(np.count_nonzero(arrays['gender'] == 'M'))
+        n_female = n_subjects - n_male
         
-        # 민족 분포
-        ethnicity_counts = {}
-        for eth in Ethnicity:
-            count = sum(1 for ind in population if ind.ethnicity == eth)
-            ethnicity_counts[eth.value] = count
-        
-        # 대사자 표현형 분포
-        metabolizer_counts = {}
-        for status in MetabolizerStatus:
-            count = sum(1 for ind in population if ind.metabolizer_status == status)
-            metabolizer_counts[status.value] = count
+        # 민족 / 대사자 표현형 분포 (코드별 개수)
+        eth_counts = np.bincount(arrays['ethnicity'], minlength=len(ETHNICITY_ORDER))
+        ethnicity_counts = {
+            eth.value: int(count) for eth, count in zip(ETHNICITY_ORDER, eth_counts)
+        }
+        met_counts = np.bincount(arrays['metabolizer'], minlength=len(METABOLIZER_ORDER))
+        metabolizer_counts = {
+            status.value: int(count) for status, count in zip(METABOLIZER_ORDER, met_counts)
+        }
         
         return {
-            'n_subjects': len(population),
+            'n_subjects': n_subjects,
             'demographics': {
-                'age': {'mean': np.mean(ages), 'sd': np.std(ages), 
-                        'min': min(ages), 'max': max(ages)},
-                'weight': {'mean': np.mean(weights), 'sd': np.std(weights),
-                          'min': min(weights), 'max': max(weights)},
+                'age': {'mean': float(np.mean(ages)), 'sd': float(np.std(ages)),
+                        'min': int(np.min(ages)), 'max': int(np.max(ages))},
+                'weight': {'mean': float(np.mean(weights)), 'sd': float(np.std(weights)),
+                          'min': float(np.min(weights)), 'max': float(np.max(weights))},
                 'gender': {'male': n_male, 'female': n_female,
-                          'male_ratio': n_male / len(population)}
+                          'male_ratio': n_male / n_subjects}
             },
             'ethnicity_distribution': ethnicity_counts,
             'metabolizer_distribution': metabolizer_counts,
             'activity_score': {
-                'mean': np.mean(activity_scores),
-                'sd': np.std(activity_scores),
-                'min': min(activity_scores),
-                'max': max(activity_scores)
+                'mean': float(np.mean(activity_scores)),
+                'sd': float(np.std(activity_scores)),
+                'min': float(np.min(activity_scores)),
+                'max': float(np.max(activity_scores))
             }
         }
 
@@ -450,17 +606,21 @@ def calculate_safety_margin(
         안전 마진 분석 결과
     """
     n_total = len(cmax_distribution)
-    n_exceeding = np.sum(cmax_distribution > toxic_threshold)
+    n_exceeding = int(np.count_nonzero(cmax_distribution > toxic_threshold))
+    
+    # 95 백분위수는 한 번만 계산하여 보고값과 안전 비율에 함께 사용
+    cmax_95th = float(np.percentile(cmax_distribution, 95))
     
     return {
         'toxic_threshold': toxic_threshold,
         'n_total': n_total,
-        'n_exceeding_threshold': int(n_exceeding),
+        'n_exceeding_threshold': n_exceeding,
         'percentage_exceeding': (n_exceeding / n_total) * 100,
         'percentage_safe': ((n_total - n_exceeding) / n_total) * 100,
         'cmax_max': float(np.max(cmax_distribution)),
-        'cmax_95th_percentile': float(np.percentile(cmax_distribution, 95)),
-        'safety_ratio': toxic_threshold / np.percentile(cmax_distribution, 95)
+        'cmax_95th_percentile': cmax_95th,
+        # 모든 Cmax가 0이면(예: F=0) 노출이 없으므로 안전 비율은 무한대
+        'safety_ratio': toxic_threshold / cmax_95th if cmax_95th > 0 else float('inf')
     }
 
 
@@ -482,8 +642,8 @@ if __name__ == "__main__":
         random_seed=42
     )
     
-    population = generator.generate()
-    summary = generator.get_population_summary(population)
+    population = generator.generate_arrays()
+    summary = generator.get_array_summary(population)
     
     print(f"Generated {summary['n_subjects']} subjects\n")
     
@@ -9,15 +9,19 @@ Compartments:
     3. Liver (간) - 대사적 청소율
 """
 
+import threading
+from functools import lru_cache
+from multiprocessing import Pool, get_start_method
+
 import numpy as np
-from scipy.integrate import odeint, trapezoid
-from dataclasses import dataclass, field
-from typing import Tuple, Optional, Dict, Any
+from scipy.integrate import odeint
+from dataclasses import dataclass
+from typing import Tuple, Optional, Dict, Any, Sequence
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DrugParameters:
-    """약물 파라미터 데이터 클래스
+    """약물 파라미터 데이터 클래스 (불변, __slots__ 사용)
     
     Attributes:
         name: 약물명
@@ -37,9 +41,12 @@ class DrugParameters:
     mw: float = 300.0 # molecular weight
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PhysiologicalParameters:
-    """생리학적 파라미터 데이터 클래스
+    """생리학적 파라미터 데이터 클래스 (불변, __slots__ 사용)
+    
+    단일 개인 시뮬레이션(PBPKModel)용입니다. 집단 시뮬레이션에서는 개인별 객체 대신
+    PHYS_DTYPE 구조화 배열(또는 pack()으로 만든 (N, 7) 행렬)을 사용합니다.
     
     Attributes:
         body_weight: 체중 (kg)
@@ -57,11 +64,38 @@ class PhysiologicalParameters:
     cl_int: float = 10.0       # L/h (intrinsic clearance)
     cl_renal: float = 0.0      # L/h
     activity_score: float = 1.0  # metabolizer status
+    
+    @staticmethod
+    def pack(params: Sequence['PhysiologicalParameters'], dtype=np.float64) -> np.ndarray:
+        """개인별 파라미터 리스트 → (N, len(PHYS_FIELDS)) 행렬"""
+        return np.array(
+            [[getattr(phys, name) for name in PHYS_FIELDS] for phys in params],
+            dtype=dtype
+        ).reshape(len(params), len(PHYS_FIELDS))
+
+
+# 집단 일괄 풀이에 쓰는 생리학적 파라미터 열 순서 (PhysiologicalParameters.pack 행렬의 열)
+PHYS_FIELDS = (
+    'body_weight', 'v_plasma', 'v_liver', 'q_liver',
+    'cl_int', 'cl_renal', 'activity_score'
+)
+
+# 인구집단 생리학적 파라미터 저장용 구조화 dtype (필드당 float32, 개인당 28 B)
+# CV 30% 수준의 파라미터에는 float32 정밀도로 충분하며, ODE 풀이 시에만 float64로 승격
+PHYS_DTYPE = np.dtype([(name, np.float32) for name in PHYS_FIELDS])
+
 
+@lru_cache(maxsize=16)
+def _time_grid(t_max: float, n_points: int) -> np.ndarray:
+    """(t_max, n_points)별 시간 배열을 한 번만 만들어 공유 (공유되므로 읽기 전용)"""
+    t = np.linspace(0, t_max, n_points)
+    t.flags.writeable = False
+    return t
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class SimulationConfig:
-    """시뮬레이션 설정
+    """시뮬레이션 설정 (불변, __slots__ 사용)
     
     Attributes:
         dose: 투여 용량 (mg)
@@ -73,6 +107,128 @@ class SimulationConfig:
     route: str = "oral"       # 'oral' or 'iv'
     t_max: float = 24.0       # hours
     n_points: int = 241       # time points
+    
+    def time_grid(self) -> np.ndarray:
+        """시간 배열 (h), 같은 설정의 풀이끼리 읽기 전용 배열 하나를 공유"""
+        return _time_grid(self.t_max, self.n_points)
+
+
+# ============================================================================
+# ODE System
+# ============================================================================
+
+def pack_rate_constants(params: Dict[str, Any]) -> Tuple[Any, ...]:
+    """ODE 파라미터 dict → RHS용 1차 속도상수 묶음 (1/h)
+
+    V_c, K_p 등으로 나누는 연산을 적분 단계마다 반복하지 않도록 미리 계산합니다.
+    값이 (N,) 배열이면 개인별 속도상수 배열을 그대로 돌려주므로 집단 일괄 풀이에도 씁니다.
+
+    Returns:
+        (k_a, 흡수 유입, 혈장 유출, 간→혈장 복귀, 혈장→간 유입, 간 유출)
+    """
+    V_c = params['V_c']
+    V_liver = params['V_liver']
+    Q_liver = params['Q_liver']
+    K_p = params['K_p']
+    
+    return (
+        params['k_a'],
+        params['k_a'] * params['F'] / V_c,
+        (Q_liver + params['CL_renal']) / V_c,
+        Q_liver / (V_c * K_p),
+        Q_liver / V_liver,
+        (Q_liver / K_p + params['CL_int'] * params['f_u']) / V_liver,
+    )
+
+
+def pbpk_rhs(y: np.ndarray, t: float, rates: Tuple[float, ...]) -> Tuple[float, float, float]:
+    """PBPK ODE 시스템
+    
+    State variables:
+        y[0]: A_gut - 장관 내 약물량 (mg)
+        y[1]: C_plasma - 혈장 농도 (mg/L = μg/mL)
+        y[2]: C_liver - 간 농도 (mg/L)
+    
+    장관: 1차 흡수 / 혈장: 흡수 + 간 복귀 - 간 유입 - 신장 청소 /
+    간: 혈장 유입 - 혈장 복귀 - 대사 (rates는 pack_rate_constants 참고)
+    
+    odeint가 바로 배열로 변환하는 불변 tuple을 반환합니다 (list보다 생성·변환이 가볍고,
+    공유 출력 버퍼와 달리 여러 요청 스레드에서 동시에 풀어도 안전).
+    """
+    A_gut, C_plasma, C_liver = y
+    k_a, k_abs, k_out, k_ret, k_up, k_elim = rates
+    
+    return (
+        -k_a * A_gut,
+        k_abs * A_gut - k_out * C_plasma + k_ret * C_liver,
+        k_up * C_plasma - k_elim * C_liver,
+    )
+
+
+def pbpk_jacobian(y: np.ndarray, t: float, rates: Tuple[float, ...]) -> np.ndarray:
+    """PBPK ODE의 해석적 Jacobian (선형계이므로 상수 행렬)
+
+    odeint의 stiff 구간에서 수치 미분(RHS 추가 호출)을 생략하게 합니다.
+    """
+    k_a, k_abs, k_out, k_ret, k_up, k_elim = rates
+    
+    return np.array([
+        [-k_a, 0.0, 0.0],
+        [k_abs, -k_out, k_ret],
+        [0.0, k_up, -k_elim],
+    ])
+
+
+def batched_pbpk_rhs(y: np.ndarray, t: float, rates: Tuple[np.ndarray, ...]) -> np.ndarray:
+    """N명 PBPK ODE를 하나로 묶은 RHS (상태는 개인별 [A_gut, C_plasma, C_liver] 순서로 인접)
+
+    개인 i의 상태가 y[3i:3i+3]에 모여 있어 Jacobian이 삼중대각(ml=mu=1)이 됩니다.
+    """
+    A_gut, C_plasma, C_liver = y.reshape(-1, 3).T
+    k_a, k_abs, k_out, k_ret, k_up, k_elim = rates
+    
+    dydt = np.empty((A_gut.size, 3))
+    dydt[:, 0] = -k_a * A_gut
+    dydt[:, 1] = k_abs * A_gut - k_out * C_plasma + k_ret * C_liver
+    dydt[:, 2] = k_up * C_plasma - k_elim * C_liver
+    return dydt.ravel()
+
+
+def batched_pbpk_jacobian_band(rates: Tuple[np.ndarray, ...]) -> np.ndarray:
+    """batched_pbpk_rhs의 띠(banded) Jacobian (odeint ml=mu=1 형식, jac[i - j + 1, j])"""
+    k_a, k_abs, k_out, k_ret, k_up, k_elim = (
+        np.broadcast_to(k, rates[1].shape) for k in rates
+    )
+    n_subjects = k_abs.size
+    
+    band = np.zeros((3, 3 * n_subjects))
+    band[1, 0::3] = -k_a        # dA_gut/dA_gut
+    band[2, 0::3] = k_abs       # dC_plasma/dA_gut
+    band[1, 1::3] = -k_out      # dC_plasma/dC_plasma
+    band[2, 1::3] = k_up        # dC_liver/dC_plasma
+    band[0, 2::3] = k_ret       # dC_plasma/dC_liver
+    band[1, 2::3] = -k_elim     # dC_liver/dC_liver
+    return band
+
+
+def _trapezoid_uniform(y: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """균일 간격 시간축의 사다리꼴 적분 (마지막 축, trapezoid(y, t)와 같은 값)
+
+    시간축은 항상 np.linspace로 만들므로 np.diff(t) 대신 첫 간격 하나만 사용합니다.
+    시간점이 1개(n_points=1)이면 trapezoid와 같이 0을 반환합니다.
+    """
+    dt = t[1] - t[0] if t.size > 1 else 0.0
+    return dt * (y.sum(axis=-1) - 0.5 * (y[..., 0] + y[..., -1]))
+
+
+def _linreg_slope(x: np.ndarray, y: np.ndarray) -> float:
+    """단순 선형회귀 기울기 (np.polyfit(x, y, 1)[0]과 같은 값, 2-pass 평균/공분산)
+
+    점이 모두 같은 x이면(분모 0) NaN을 반환합니다.
+    """
+    dx = x - x.mean()
+    denom = np.dot(dx, dx)
+    return float(np.dot(dx, y - y.mean()) / denom) if denom > 0 else np.nan
 
 
 class PBPKModel:
@@ -109,48 +265,6 @@ class PBPKModel:
         kp = 0.5 + 0.5 * 10 ** (0.7 * log_p - 0.3) * f_u
         return max(1.0, min(kp, 50.0))  # Clamp between 1-50
     
-    def _ode_system(self, y: np.ndarray, t: float, params: Dict[str, float]) -> list:
-        """PBPK ODE 시스템
-        
-        State variables:
-            y[0]: A_gut - 장관 내 약물량 (mg)
-            y[1]: C_plasma - 혈장 농도 (mg/L = μg/mL)
-            y[2]: C_liver - 간 농도 (mg/L)
-        """
-        A_gut, C_plasma, C_liver = y
-        
-        # Parameters
-        k_a = params['k_a']
-        F = params['F']
-        V_c = params['V_c']
-        V_liver = params['V_liver']
-        Q_liver = params['Q_liver']
-        CL_int = params['CL_int']
-        CL_renal = params['CL_renal']
-        f_u = params['f_u']
-        K_p = params['K_p']
-        
-        # Differential equations
-        # 장관 구획: 1차 흡수
-        dA_gut_dt = -k_a * A_gut
-        
-        # 중심 구획 (혈장)
-        absorption = (k_a * A_gut * F) / V_c
-        liver_uptake = (Q_liver / V_c) * C_plasma
-        liver_return = (Q_liver / V_c) * (C_liver / K_p)
-        renal_clearance = (CL_renal / V_c) * C_plasma
-        
-        dC_plasma_dt = absorption - liver_uptake + liver_return - renal_clearance
-        
-        # 간 구획
-        hepatic_uptake = (Q_liver / V_liver) * C_plasma
-        hepatic_return = (Q_liver / V_liver) * (C_liver / K_p)
-        metabolism = (CL_int * f_u / V_liver) * C_liver
-        
-        dC_liver_dt = hepatic_uptake - hepatic_return - metabolism
-        
-        return [dA_gut_dt, dC_plasma_dt, dC_liver_dt]
-    
     def solve(self) -> Dict[str, Any]:
         """PBPK 모델 풀이
         
@@ -162,7 +276,7 @@ class PBPKModel:
                 - pk_metrics: PK 파라미터 (Cmax, Tmax, AUC, t_half)
         """
         # Time array
-        t = np.linspace(0, self.config.t_max, self.config.n_points)
+        t = self.config.time_grid()
         
         # Effective intrinsic clearance (adjusted by activity score)
         effective_cl_int = self.phys.cl_int * self.phys.activity_score
@@ -191,12 +305,15 @@ class PBPKModel:
             # IV: all drug in plasma
             y0 = [0.0, self.config.dose / v_central, 0.0]
         
-        # Solve ODE
-        solution = odeint(self._ode_system, y0, t, args=(params,))
+        # Solve ODE (속도상수는 풀이 전에 한 번만 계산해 파이썬 float로 RHS에 전달)
+        rates = tuple(float(k) for k in pack_rate_constants(params))
+        solution = odeint(pbpk_rhs, y0, t, args=(rates,), Dfun=pbpk_jacobian)
         
         # Extract concentrations (convert to ng/mL: mg/L * 1000 = μg/L = ng/mL)
-        c_plasma = solution[:, 1] * 1000  # ng/mL
-        c_liver = solution[:, 2] * 1000   # ng/mL
+        # 풀이 결과의 농도 열에 제자리로 곱하고 열 view를 사용 (새 배열 할당 없음)
+        solution[:, 1:] *= 1000
+        c_plasma = solution[:, 1]  # ng/mL
+        c_liver = solution[:, 2]   # ng/mL
         
         # Calculate PK metrics
         pk_metrics = self._calculate_pk_metrics(t, c_plasma)
@@ -209,7 +326,8 @@ class PBPKModel:
             'parameters': params
         }
     
-    def _calculate_pk_metrics(self, t: np.ndarray, c_plasma: np.ndarray) -> Dict[str, float]:
+    @staticmethod
+    def _calculate_pk_metrics(t: np.ndarray, c_plasma: np.ndarray) -> Dict[str, float]:
         """PK 파라미터 계산
         
         Args:
@@ -224,18 +342,22 @@ class PBPKModel:
         cmax = float(c_plasma[cmax_idx])
         tmax = float(t[cmax_idx])
         
-        # AUC (trapezoidal rule)
-        auc = float(trapezoid(c_plasma, t))
+        # AUC (trapezoidal rule, 균일 시간 간격)
+        auc = float(_trapezoid_uniform(c_plasma, t))
         
         # Half-life estimation (terminal phase)
         # Find points after Cmax where concentration > 10% of Cmax
-        terminal_mask = (t > tmax) & (c_plasma > 0.1 * cmax)
-        if np.sum(terminal_mask) > 2:
-            t_terminal = t[terminal_mask]
-            c_terminal = c_plasma[terminal_mask]
-            # Log-linear regression
-            log_c = np.log(c_terminal + 1e-10)
-            slope, _ = np.polyfit(t_terminal, log_c, 1)
+        # (t는 단조 증가하므로 't > tmax'는 cmax_idx 다음부터의 slice view와 같음)
+        t_after = t[cmax_idx + 1:]
+        c_after = c_plasma[cmax_idx + 1:]
+        terminal_mask = c_after > 0.1 * cmax
+        if np.count_nonzero(terminal_mask) > 2:
+            t_terminal = t_after[terminal_mask]
+            # Log-linear regression (boolean 인덱싱 결과는 새 배열이므로 그 자리에서 log)
+            # 말기 구간 농도는 Cmax의 10% 초과로 항상 양수이므로 0 회피용 epsilon 불필요
+            log_c = c_after[terminal_mask]
+            np.log(log_c, out=log_c)
+            slope = _linreg_slope(t_terminal, log_c)
             t_half = -np.log(2) / slope if slope < 0 else np.nan
         else:
             t_half = np.nan
@@ -248,63 +370,227 @@ class PBPKModel:
         }
 
 
+# 병렬(n_workers > 1)을 요청해도 이 인원 이하는 순차 실행
+# 일괄 풀이는 순차로도 N=1000에 약 0.1 s, N=5000에 약 0.4 s라서 그보다 작으면
+# 호출마다 Pool을 만드는 비용(fork 수십 ms, spawn 수 초)이 풀이 시간보다 큼
+PARALLEL_MIN_SUBJECTS = 5000
+
+
+def _simulate_chunk(
+    drug_params: DrugParameters,
+    phys_columns: Dict[str, np.ndarray],
+    sim_config: SimulationConfig,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """여러 명을 하나의 ODE 시스템으로 묶어 한 번에 풀이 (프로세스 풀에서 pickle 가능)
+
+    Args:
+        phys_columns: PHYS_FIELDS별 (N,) 배열
+        out: 결과를 기록할 (N, n_points) 배열 (주어지면 새로 할당하지 않음)
+
+    Returns:
+        (N, n_points) 혈장 농도 배열 (ng/mL, out이 없으면 float32)
+    """
+    t = sim_config.time_grid()
+    k_p_liver = PBPKModel(drug_params, sim_config=sim_config).k_p_liver
+    
+    v_central = drug_params.v_d * phys_columns['body_weight']
+    params = {
+        'k_a': drug_params.k_a,
+        'F': drug_params.f,
+        'V_c': v_central,
+        'V_liver': phys_columns['v_liver'],
+        'Q_liver': phys_columns['q_liver'],
+        'CL_int': phys_columns['cl_int'] * phys_columns['activity_score'],
+        'CL_renal': phys_columns['cl_renal'],
+        'f_u': drug_params.f_u,
+        'K_p': k_p_liver
+    }
+    rates = pack_rate_constants(params)
+    jac_band = batched_pbpk_jacobian_band(rates)
+    
+    # Initial conditions (개인별 [A_gut, C_plasma, C_liver])
+    y0 = np.zeros((v_central.size, 3))
+    if sim_config.route == "oral":
+        y0[:, 0] = sim_config.dose
+    else:
+        y0[:, 1] = sim_config.dose / v_central
+    
+    solution = odeint(
+        batched_pbpk_rhs, y0.ravel(), t, args=(rates,),
+        Dfun=lambda y, t, rates: jac_band, ml=1, mu=1
+    )
+    
+    # (n_points, 3N) → (N, n_points) 혈장 농도, ng/mL로 변환 (out에 바로 기록)
+    # 풀이는 float64, 저장만 float32 (프로세스 간 전송량과 이후 통계 연산의 메모리 대역폭 절반)
+    if out is None:
+        out = np.empty((v_central.size, sim_config.n_points), dtype=np.float32)
+    return np.multiply(solution[:, 1::3].T, 1000, out=out)
+
+
 def run_population_simulation(
     drug_params: DrugParameters,
     population_phys_params: list,
-    sim_config: SimulationConfig
+    sim_config: SimulationConfig,
+    n_workers: int = 1
 ) -> Dict[str, Any]:
     """집단 시뮬레이션 실행
     
+    개인별로 odeint를 반복 호출하지 않고, 전체 인원의 상태를 하나의 ODE
+    시스템으로 묶어 벡터화된 RHS로 한 번에 풉니다. 기본은 순차 실행이며,
+    n_workers > 1이고 인원이 PARALLEL_MIN_SUBJECTS를 넘을 때만 인구집단을
+    n_workers개로 나누어 multiprocessing.Pool에서 풉니다.
+    
+    병렬 실행은 `if __name__ == "__main__":` 아래의 배치 스크립트용 opt-in이며,
+    시작 방식이 fork인 단일 스레드 프로세스에서만 Pool을 만듭니다.
+    다른 스레드가 살아 있는 프로세스(Flask/Dash 요청 핸들러 등)에서는 fork 교착 위험이
+    있고, spawn/forkserver에서는 작업 프로세스마다 실행 중인 스크립트를 다시 import하므로
+    이런 경우에는 n_workers와 관계없이 순차로 풉니다.
+    
     Args:
         drug_params: 약물 파라미터
-        population_phys_params: 개인별 생리학적 파라미터 리스트
+        population_phys_params: 개인별 생리학적 파라미터 리스트,
+            PHYS_DTYPE 구조화 배열, PHYS_FIELDS별 (N,) 배열 dict
+            (generate_arrays() 결과 dict도 가능), 또는 (N, len(PHYS_FIELDS)) 행렬
         sim_config: 시뮬레이션 설정
+        n_workers: 병렬 프로세스 수 (기본값 1 = 순차 실행)
         
     Returns:
         Dictionary with population simulation results
     """
-    n_subjects = len(population_phys_params)
-    n_points = sim_config.n_points
+    if isinstance(population_phys_params, dict):
+        # PopulationGenerator.generate_arrays() 결과 전체 → 그 ['phys']
+        population_phys_params = population_phys_params.get('phys', population_phys_params)
     
-    # Result arrays
-    all_c_plasma = np.zeros((n_subjects, n_points))
-    all_pk_metrics = []
+    if isinstance(population_phys_params, dict) or (
+        isinstance(population_phys_params, np.ndarray) and population_phys_params.dtype.names
+    ):
+        # PHYS_DTYPE 구조화 배열 또는 필드별 배열 dict: 필드 이름으로 열을 꺼내 float64로 승격
+        phys_columns = {
+            name: np.asarray(population_phys_params[name], dtype=np.float64)
+            for name in PHYS_FIELDS
+        }
+    else:
+        if not isinstance(population_phys_params, np.ndarray):
+            population_phys_params = PhysiologicalParameters.pack(population_phys_params)
+        matrix = np.asarray(population_phys_params, dtype=np.float64)
+        phys_columns = {name: matrix[:, i] for i, name in enumerate(PHYS_FIELDS)}
+    n_subjects = phys_columns['body_weight'].size
     
-    time = None
+    # 전체 농도 곡선 배열은 한 번만 할당하고, 구간별 결과를 제자리에 채움
+    # (유효숫자 6~7자리면 충분한 저장용이므로 float32; ODE 풀이 자체는 float64)
+    all_c_plasma = np.empty((n_subjects, sim_config.n_points), dtype=np.float32)
     
-    for i, phys_params in enumerate(population_phys_params):
-        model = PBPKModel(drug_params, phys_params, sim_config)
-        result = model.solve()
-        
-        if time is None:
-            time = result['time']
-        
-        all_c_plasma[i, :] = result['c_plasma']
-        all_pk_metrics.append(result['pk_metrics'])
+    parallel = (
+        n_workers > 1
+        and n_subjects > PARALLEL_MIN_SUBJECTS
+        and threading.active_count() == 1   # 단일 스레드 프로세스에서만 Pool 생성
+        and get_start_method() == 'fork'    # spawn/forkserver는 __main__ 재-import 비용
+    )
+    if parallel:
+        bounds = np.linspace(0, n_subjects, n_workers + 1).astype(int)
+        slabs = [(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+        args = [
+            (drug_params, {name: col[lo:hi] for name, col in phys_columns.items()}, sim_config)
+            for lo, hi in slabs
+        ]
+        with Pool(processes=len(args)) as pool:
+            for (lo, hi), chunk in zip(slabs, pool.starmap(_simulate_chunk, args)):
+                all_c_plasma[lo:hi] = chunk
+    else:
+        _simulate_chunk(drug_params, phys_columns, sim_config, out=all_c_plasma)
+    
+    time = sim_config.time_grid()
+    pk = population_pk_metrics(time, all_c_plasma)
     
     # Population statistics
-    mean_c = np.mean(all_c_plasma, axis=0)
-    std_c = np.std(all_c_plasma, axis=0)
-    percentile_5 = np.percentile(all_c_plasma, 5, axis=0)
-    percentile_95 = np.percentile(all_c_plasma, 95, axis=0)
+    # (평균을 한 번만 구해 np.std에 넘겨, 표준편차 계산 시 (N, T) 배열을 다시 훑지 않음)
+    mean_c = np.mean(all_c_plasma, axis=0, keepdims=True)
+    std_c = np.std(all_c_plasma, axis=0, mean=mean_c)
+    mean_c = mean_c[0]
+    percentile_5, median_c, percentile_95 = curve_percentiles(all_c_plasma, (5, 50, 95))
     
-    # Extract Cmax values for safety analysis
-    cmax_values = [m['cmax'] for m in all_pk_metrics]
-    auc_values = [m['auc'] for m in all_pk_metrics]
+    # 개인별 PK 파라미터 dict (PBPKModel.solve()의 pk_metrics와 같은 형식)
+    all_pk_metrics = [
+        {'cmax': float(cmax), 'tmax': float(tmax), 'auc': float(auc),
+         't_half': None if np.isnan(t_half) else float(t_half)}
+        for cmax, tmax, auc, t_half in zip(pk['cmax'], pk['tmax'], pk['auc'], pk['t_half'])
+    ]
     
     return {
         'time': time,
         'individual_curves': all_c_plasma,
         'mean_concentration': mean_c,
+        'median_concentration': median_c,
         'std_concentration': std_c,
         'ci_lower': percentile_5,
         'ci_upper': percentile_95,
-        'cmax_distribution': np.array(cmax_values),
-        'auc_distribution': np.array(auc_values),
+        'cmax_distribution': pk['cmax'],
+        'auc_distribution': pk['auc'],
         'pk_metrics_list': all_pk_metrics
     }
 
 
+def curve_percentiles(curves: np.ndarray, q: Sequence[float]) -> np.ndarray:
+    """시간점별 집단 백분위수 (np.percentile(curves, q, axis=0)과 같은 선형 보간 결과)
+    
+    필요한 순위(k번째 값)를 한 번의 np.partition으로 모두 구한 뒤 보간합니다.
+    개인 축이 연속되도록 (T, N)으로 전치해 분할하므로 축 이동/정렬이 반복되지 않습니다.
+    
+    Args:
+        curves: (N, T) 농도 배열
+        q: 백분위수 목록 (0~100)
+        
+    Returns:
+        (len(q), T) 백분위수 배열
+    """
+    n = curves.shape[0]
+    rank = np.asarray(q, dtype=np.float64) / 100 * (n - 1)
+    lower = np.floor(rank).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    frac = (rank - lower)[:, None]
+    
+    part = np.partition(curves.T, np.union1d(lower, upper), axis=1)
+    return part[:, lower].T * (1 - frac) + part[:, upper].T * frac
+
+
+def population_pk_metrics(t: np.ndarray, curves: np.ndarray) -> Dict[str, np.ndarray]:
+    """집단 PK 파라미터를 (N, T) 곡선 배열에서 한 번에 계산
+    
+    PBPKModel._calculate_pk_metrics와 같은 정의를 개인별 반복 없이 벡터화합니다.
+    반감기는 Cmax 이후 Cmax의 10% 초과 구간에서 log-선형 최소제곱 기울기로 구합니다.
+    
+    Args:
+        t: 시간 배열 (T,)
+        curves: 개인별 혈장 농도 (N, T), ng/mL
+        
+    Returns:
+        Dictionary of (N,) arrays: cmax, tmax, auc, t_half (추정 불가 시 NaN)
+    """
+    cmax_idx = np.argmax(curves, axis=1)
+    cmax = curves[np.arange(curves.shape[0]), cmax_idx]
+    tmax = t[cmax_idx]
+    auc = _trapezoid_uniform(curves, t)
+    
+    # Terminal phase: Cmax 이후 & Cmax의 10% 초과
+    mask = (t[None, :] > tmax[:, None]) & (curves > 0.1 * cmax[:, None])
+    n = mask.sum(axis=1)
+    x = np.where(mask, t[None, :], 0.0)
+    # 마스크된(항상 양수) 점에서만 log를 계산해 float64 버퍼에 기록, 나머지는 0
+    # (곡선이 float32로 저장되어 있어도 log/회귀 합산은 float64로)
+    y = np.zeros(curves.shape)
+    np.log(curves, out=y, where=mask)
+    
+    # 마스크된 점들의 단순 선형회귀 기울기 (np.polyfit(deg=1)과 동일)
+    sx, sy = x.sum(axis=1), y.sum(axis=1)
+    sxx, sxy = (x * x).sum(axis=1), (x * y).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+        t_half = np.where((n > 2) & (slope < 0), -np.log(2) / slope, np.nan)
+    
+    return {'cmax': cmax, 'tmax': tmax, 'auc': auc, 't_half': t_half}
+
+
 if __name__ == "__main__":
     # Test the model
     print("=== PBPK Model Test ===\n")
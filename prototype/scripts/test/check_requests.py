@@ -1,5 +1,7 @@
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 print("1. requests 모듈 임포트 시작...")
 start_time = time.time()
@@ -10,13 +12,20 @@ except ImportError:
     print("   - 임포트 실패! 가상환경 설정을 확인해주세요.")
     exit()
 
+# 연결(TCP/TLS)을 재사용하는 세션 + 요청 제한(429)/일시적 서버 오류(502/503/504) 재시도
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+))
+
 print("\n2. PubChem API 연결 테스트 중...")
 cid = "11962412"
 url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/JSON"
 
 try:
     # 5초 타임아웃 설정
-    response = requests.get(url, timeout=5)
+    response = session.get(url, timeout=5)
     print(f"   - 응답 코드: {response.status_code}")
     if response.status_code == 200:
         print("   - 데이터 로드 성공!")
@@ -28,3 +37,26 @@ except requests.exceptions.Timeout:
     print("   - [에러] 요청 시간이 초과되었습니다. (Timeout)")
 except Exception as e:
     print(f"   - [에러] 연결 중 문제 발생: {e}")
+
+print("\n3. PubChem 여러 CID 일괄 조회 테스트 중...")
+# CID마다 요청하지 않고 쉼표로 이어 한 번의 요청으로 조회 (왕복 지연 1회)
+cids = ["11962412", "2244", "3672"]
+batch_url = (
+    "https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/"
+    f"{','.join(cids)}/property/MolecularWeight,XLogP/JSON"
+)
+
+try:
+    start_time = time.time()
+    response = session.get(batch_url, timeout=5)
+    print(f"   - 응답 코드: {response.status_code} (소요시간: {time.time() - start_time:.4f}초)")
+    if response.status_code == 200:
+        properties = response.json()['PropertyTable']['Properties']
+        for prop in properties:
+            print(f"   - CID {prop['CID']}: MW={prop.get('MolecularWeight')}, XLogP={prop.get('XLogP')}")
+    else:
+        print("   - 데이터 로드 실패")
+except requests.exceptions.Timeout:
+    print("   - [에러] 요청 시간이 초과되었습니다. (Timeout)")
+except Exception as e:
+    print(f"   - [에러] 연결 중 문제 발생: {e}")
@@ -0,0 +1,63 @@
+"""models 패키지 회귀 테스트 (prototype 폴더에서 python -m unittest discover -s tests)"""
+
+import math
+import multiprocessing
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# prototype 폴더를 경로에 추가 (models 패키지 import 위해)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models.pbpk_model as pbpk_model
+from models import (
+    calculate_safety_margin, PopulationGenerator,
+    DrugParameters, SimulationConfig, run_population_simulation
+)
+
+
+class CalculateSafetyMarginTest(unittest.TestCase):
+    def test_zero_exposure_gives_infinite_safety_ratio(self):
+        result = calculate_safety_margin(np.zeros(10), 1000)
+        
+        self.assertTrue(math.isinf(result['safety_ratio']))
+        self.assertEqual(result['cmax_95th_percentile'], 0.0)
+        self.assertEqual(result['n_exceeding_threshold'], 0)
+        self.assertEqual(result['percentage_safe'], 100.0)
+    
+    def test_safety_ratio_uses_95th_percentile(self):
+        cmax = np.arange(1, 101, dtype=np.float64)
+        result = calculate_safety_margin(cmax, 50)
+        
+        p95 = np.percentile(cmax, 95)
+        self.assertAlmostEqual(result['cmax_95th_percentile'], p95)
+        self.assertAlmostEqual(result['safety_ratio'], 50 / p95)
+        self.assertEqual(result['n_exceeding_threshold'], 50)
+
+
+class RunPopulationSimulationTest(unittest.TestCase):
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                         '병렬 경로는 fork 시작 방식에서만 사용')
+    def test_pooled_matches_serial(self):
+        population = PopulationGenerator(n_subjects=400, random_seed=7).generate_arrays()
+        config = SimulationConfig(t_max=24, n_points=97)
+        
+        serial = run_population_simulation(DrugParameters(), population, config, n_workers=1)
+        # 작은 인원으로도 Pool 경로를 타도록 임계값을 낮추고, 실제로 Pool이 쓰였는지 확인
+        with mock.patch.object(pbpk_model, 'PARALLEL_MIN_SUBJECTS', 0), \
+                mock.patch.object(pbpk_model, 'Pool', wraps=pbpk_model.Pool) as pool:
+            pooled = run_population_simulation(DrugParameters(), population, config, n_workers=2)
+        self.assertTrue(pool.called)
+        
+        # 구간별로 푼 ODE는 오차 제어 단계가 달라 완전히 같지는 않음
+        for name in ('individual_curves', 'mean_concentration', 'ci_lower', 'ci_upper',
+                     'cmax_distribution', 'auc_distribution'):
+            np.testing.assert_allclose(pooled[name], serial[name], rtol=1e-4, atol=1e-3,
+                                       err_msg=name)
+
+
+if __name__ == '__main__':
+    unittest.main()